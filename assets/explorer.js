@@ -0,0 +1,60 @@
+// clientside callbacks for the shot explorer, they filter the shots loaded into explorer-data without asking the server
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    explorer: {
+        options: function(data) {
+            if(!data || data.error) {
+                return [[], [], [], []];
+            }
+            var seasons = Object.keys(data.seasons).sort();
+            var seasonOptions = seasons.map(function(season) { return {label: season, value: season}; });
+            var zoneOptions = data.zones.map(function(zone) { return {label: zone, value: zone}; });
+            return [seasonOptions, seasons, zoneOptions, data.zones.slice()];
+        },
+
+        figure: function(data, results, seasons, zones, figure) {
+            if(!data) {
+                return window.dash_clientside.no_update;
+            }
+            var layout = Object.assign({}, figure.layout); // the court and axes stay as the server first drew them
+            if(data.error) {
+                layout.title = {text: data.error};
+                return {data: [], layout: layout};
+            }
+
+            var zoneCodes = {};
+            (zones || []).forEach(function(zone) { zoneCodes[data.zones.indexOf(zone)] = true; });
+            var showMade = (results || []).indexOf('made') >= 0;
+            var showMissed = (results || []).indexOf('missed') >= 0;
+            var made = {x: [], y: []};
+            var missed = {x: [], y: []};
+            (seasons || []).slice().sort().forEach(function(season) {
+                var shots = data.seasons[season];
+                if(!shots) {
+                    return;
+                }
+                for(var i = 0; i < shots.x.length; i++) {
+                    if(!zoneCodes[shots.zone[i]]) {
+                        continue;
+                    }
+                    var target = shots.made[i] ? made : missed;
+                    target.x.push(shots.x[i]);
+                    target.y.push(shots.y[i]);
+                }
+            });
+
+            var points = (showMade ? made.x.length : 0) + (showMissed ? missed.x.length : 0);
+            var type = points > data.webglThreshold ? 'scattergl' : 'scatter'; // same switch as shotfigure.scatterClass
+            var traces = [];
+            if(showMade) {
+                traces.push({type: type, x: made.x, y: made.y, mode: 'markers', marker: {color: 'BLUE'}, name: 'Made Shot'});
+            }
+            if(showMissed) {
+                traces.push({type: type, x: missed.x, y: missed.y, mode: 'markers', marker: {color: 'RED'}, name: 'Missed Shot'});
+            }
+            var attempts = made.x.length + missed.x.length;
+            var pct = attempts ? (100 * made.x.length / attempts).toFixed(1) : '0.0';
+            layout.title = {text: 'Shots by ' + data.name + ': ' + made.x.length + '/' + attempts + ' (' + pct + '%)'};
+            return {data: traces, layout: layout};
+        }
+    }
+});
@@ -0,0 +1,257 @@
+#times each stage of drawing a shot chart over recorded ShotChartDetail responses so runs can be compared across commits
+#python benchmark.py record              records the fixtures from stats.nba.com (once), through shotchart/transport.py
+#python benchmark.py synthesize          writes fixtures of the same shape and size without the network
+#python benchmark.py run                 times every stage and saves benchmarks/results/<commit>.json
+#python benchmark.py compare OLD NEW     prints the change between two saved runs
+#python benchmark.py imports             times importing each module cli jobs and workers load, fails over the budget
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import tempfile
+import subprocess
+import datetime
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+RESULT_DIR = os.path.join(BENCH_DIR, "results")
+
+#fixture name -> (player, seasons, shots to synthesize)
+FIXTURES = {
+    "small": ("Jordan Bell", ["2018-19"], 300),
+    "medium": ("Brook Lopez", ["2018-19"], 1200),
+    "career": ("LeBron James", [f"{str(year)}-{str(year+1)[-2:]}" for year in range(2003, 2019)], 25000),
+}
+
+SHOT_HEADERS = ["GRID_TYPE", "GAME_ID", "GAME_EVENT_ID", "PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_NAME", "PERIOD", "MINUTES_REMAINING", "SECONDS_REMAINING", "EVENT_TYPE", "ACTION_TYPE", "SHOT_TYPE", "SHOT_ZONE_BASIC", "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE", "SHOT_DISTANCE", "LOC_X", "LOC_Y", "SHOT_ATTEMPTED_FLAG", "SHOT_MADE_FLAG", "GAME_DATE", "HTM", "VTM"]
+
+#modules workers and cli jobs import before doing any work, each must stay under IMPORT_BUDGET on its own
+IMPORT_MODULES = ["shotchart", "shotchart.shotcache", "shotchart.transport", "shotchart.statshttp", "shotchart.playerindex", "shotchart.catalog", "shotchart.shotstore", "shotchart.figurecache", "shotchart.warmcache"]
+IMPORT_BUDGET = float(os.environ.get("SHOTCHART_IMPORT_BUDGET", 0.1)) #seconds, interpreter start not counted
+
+FUZZY_NAMES = ["Steph Curry", "Kawhi Leonrad", "Lebron Jmaes", "Dirk Nowitski", "zzzz qqq"] #miss the exact and prefix lookups, like a typo in the search box
+LOOKUP_NAMES = ["LeBron James", "lebron james", "Brook Lopez", "Nikola Jokic", "Giannis Antetokounmpo", "Steph Curry", "Kawhi Leonrad", "Luka Doncic"]
+
+def fixturePath(name):
+    return os.path.join(FIXTURE_DIR, name + ".json")
+
+def recordFixtures():
+    from shotchart.transport import getTransport
+    from shotchart.playerindex import getPlayerID
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, (playerName, seasons, _) in FIXTURES.items():
+        response = None
+        for season in seasons: #a career fixture is every season's rows in one response
+            seasonResponse = getTransport().request(dict(team_id = 0, player_id = getPlayerID(playerName), season_nullable= season, context_measure_simple= "FGA", date_from_nullable= ""))
+            if(response is None):
+                response = seasonResponse
+            else:
+                response["resultSets"][0]["rowSet"].extend(seasonResponse["resultSets"][0]["rowSet"])
+        response["fixture"] = {"player": playerName, "seasons": seasons, "synthetic": False}
+        with open(fixturePath(name), "w") as f:
+            json.dump(response, f)
+        print("recorded %s: %d shots" % (name, len(response["resultSets"][0]["rowSet"])))
+
+def synthesizeFixtures():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    zones = [("Restricted Area", "Center(C)", "Less Than 8 ft.", "2PT Field Goal"), ("Mid-Range", "Left Side(L)", "8-16 ft.", "2PT Field Goal"), ("Above the Break 3", "Center(C)", "24+ ft.", "3PT Field Goal"), ("Left Corner 3", "Left Side(L)", "24+ ft.", "3PT Field Goal")]
+    actions = ["Jump Shot", "Layup Shot", "Driving Layup Shot", "Pullup Jump shot", "Dunk Shot"]
+    for name, (playerName, seasons, shots) in FIXTURES.items():
+        rng = random.Random(name)
+        rows = []
+        for i in range(shots):
+            season = seasons[i * len(seasons) // shots]
+            zone = rng.choice(zones)
+            made = int(rng.random() < 0.46)
+            x = rng.randint(-250, 250)
+            y = rng.randint(-47, 420)
+            rows.append(["Shot Chart Detail", "002%s%05d" % (season[2:4], i // 20), i % 600, 2544, playerName, 1610612747, "Team", rng.randint(1, 4), rng.randint(0, 11), rng.randint(0, 59), "Made Shot" if made else "Missed Shot", rng.choice(actions), zone[3], zone[0], zone[1], zone[2], int((x*x + y*y) ** 0.5) // 10, x, y, 1, made, "%s1%03d" % (season[:4], 15 + i // 100 % 60), "HOM", "VIS"])
+        response = {
+            "resource": "shotchart",
+            "resultSets": [{"name": "Shot_Chart_Detail", "headers": SHOT_HEADERS, "rowSet": rows}],
+            "fixture": {"player": playerName, "seasons": seasons, "synthetic": True}
+        }
+        with open(fixturePath(name), "w") as f:
+            json.dump(response, f)
+        print("synthesized %s: %d shots" % (name, shots))
+
+def timeStage(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+
+def importTime(module): #in a fresh interpreter every time, so nothing is already in sys.modules
+    code = "import time; start = time.perf_counter(); import %s; print(time.perf_counter() - start)" % module
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)))
+    return float(output.decode().split()[-1])
+
+def importTimes(repeat=5):
+    stages = {}
+    for module in IMPORT_MODULES:
+        times = [importTime(module) for _ in range(repeat)]
+        stages["import_" + module.split(".")[-1]] = {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+    return stages
+
+def checkImports(repeat=5, budget=IMPORT_BUDGET):
+    failures = 0
+    for stage, timing in importTimes(repeat).items():
+        over = timing["median"] > budget
+        failures += over
+        print("%-28s %10.3f ms%s" % (stage, timing["median"] * 1000, "  over the %.0f ms budget" % (budget * 1000) if over else ""))
+    return failures
+
+def currentCommit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def runBenchmarks(repeat=20):
+    import plotly.io as pio
+    from shotchart import playerindex
+    from shotchart import courtshapes
+    from shotchart.shotstore import compactShots
+    from shotchart.shotcache import responseFrame, readShotData, writeShotData
+    from shotchart.shotfigure import shotChartFigure, seasonGridFigure, courtFigure, chartTraces
+    from shotchartgrapher import subplotFigure
+
+    results = {"commit": currentCommit(), "date": datetime.datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(), "stages": {}, "fixtures": {}}
+
+    def coldIndex():
+        playerindex._index = None
+        playerindex.findPlayer.cache_clear()
+        playerindex.getPlayerIndex()
+    def lookups():
+        playerindex.findPlayer.cache_clear() #time the index, not the memo in front of it
+        for name in LOOKUP_NAMES:
+            playerindex.findPlayer(name)
+    results["stages"].update(importTimes(max(repeat // 4, 1)))
+    results["stages"]["name_index_build"] = timeStage(coldIndex, max(repeat // 4, 1))
+    results["stages"]["name_lookup"] = timeStage(lookups, repeat)
+    results["stages"]["name_fuzzy"] = timeStage(lambda: [playerindex.suggestPlayers(name) for name in FUZZY_NAMES], repeat) #update_suggestions on every keystroke the trie misses
+
+    for name in FIXTURES:
+        path = fixturePath(name)
+        if(not os.path.exists(path)):
+            print("no %s fixture, run 'python benchmark.py record' or 'synthesize' first" % name)
+            continue
+        with open(path) as f:
+            raw = f.read()
+        meta = json.loads(raw)["fixture"]
+        seasons = meta["seasons"]
+        stages = {}
+
+        def parse():
+            return compactShots(responseFrame(json.loads(raw))) #what the shot cache does with a fresh response
+        stages["fetch_parse"] = timeStage(parse, repeat)
+        shotData = parse()
+
+        with tempfile.TemporaryDirectory() as cacheDir: #what every repeat view reads instead of fetching
+            path = os.path.join(cacheDir, "%s.parquet" % name)
+            writeShotData(path, shotData)
+            stages["cache_read"] = timeStage(lambda: readShotData(path), repeat)
+
+        def flipSplit():
+            flipped = shotData.copy()
+            flipped["LOC_X"] *= -1
+            made_shots = flipped.loc[flipped.SHOT_MADE_FLAG == 1]
+            missed_shots = flipped.loc[flipped.SHOT_MADE_FLAG == 0]
+            return made_shots, missed_shots
+        stages["flip_split"] = timeStage(flipSplit, repeat)
+
+        def shapes():
+            courtshapes.getCourtShapes.cache_clear()
+            return courtshapes.getCourtShapes(len(seasons))
+        stages["make_shapes"] = timeStage(shapes, repeat)
+
+        title = "Shots by %s" % meta["player"]
+        def appFigure(): #what dashapp.update_figure builds for a season it has not cached yet
+            flipped = shotData.copy()
+            flipped["LOC_X"] *= -1
+            return courtFigure(title).add_traces(chartTraces(flipped))
+        stages["app_figure"] = timeStage(appFigure, repeat)
+        stages["single_figure"] = timeStage(lambda: shotChartFigure(shotData, title), repeat) #singlegraph / exportcharts
+        framesBySeason = {season: shotData.loc[shotData.GAME_DATE // 10000 == int(season[:4]) + (shotData.GAME_DATE % 10000 < 900)] for season in seasons} #rows back to the season they were played in
+        stages["season_grid_figure"] = timeStage(lambda: seasonGridFigure(title, seasons, framesBySeason), max(repeat // 4, 1)) #dashapp.update_career
+        if(len(seasons) > 1): #plotShots2 always draws at least two seasons
+            flippedList = [framesBySeason[season].assign(LOC_X=-framesBySeason[season]["LOC_X"]) for season in seasons]
+            stages["subplot_figure"] = timeStage(lambda: subplotFigure(flippedList, seasons), max(repeat // 4, 1)) #shotchartgrapher.plotShots2
+        fig = shotChartFigure(shotData, title)
+        stages["figure_json"] = timeStage(lambda: pio.to_json(fig, validate=False), repeat)
+
+        results["fixtures"][name] = {"shots": len(shotData), "seasons": len(seasons), "synthetic": meta.get("synthetic", False), "stages": stages}
+
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    path = os.path.join(RESULT_DIR, "%s.json" % results["commit"])
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1)
+    printResults(results)
+    print("saved %s" % path)
+    return results
+
+def printResults(results):
+    for stage, timing in results["stages"].items():
+        print("%-28s %10.3f ms" % (stage, timing["median"] * 1000))
+    for name, fixture in results["fixtures"].items():
+        print("%s (%d shots%s)" % (name, fixture["shots"], ", synthetic" if fixture["synthetic"] else ""))
+        for stage, timing in fixture["stages"].items():
+            print("  %-26s %10.3f ms" % (stage, timing["median"] * 1000))
+
+def compareResults(oldPath, newPath):
+    with open(oldPath) as f:
+        old = json.load(f)
+    with open(newPath) as f:
+        new = json.load(f)
+    print("%s -> %s (median, new/old)" % (old["commit"], new["commit"]))
+    rows = [("", stage, old["stages"].get(stage), timing) for stage, timing in new["stages"].items()]
+    for name, fixture in new["fixtures"].items():
+        oldStages = old["fixtures"].get(name, {}).get("stages", {})
+        rows.extend((name, stage, oldStages.get(stage), timing) for stage, timing in fixture["stages"].items())
+    for name, stage, oldTiming, newTiming in rows:
+        label = "%s %s" % (name, stage) if name else stage
+        if(oldTiming is None):
+            print("%-34s %10s %10.3f ms" % (label, "-", newTiming["median"] * 1000))
+        else:
+            print("%-34s %10.3f %10.3f ms  x%.2f" % (label, oldTiming["median"] * 1000, newTiming["median"] * 1000, newTiming["median"] / max(oldTiming["median"], 1e-12)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shot chart benchmarks")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("record")
+    subparsers.add_parser("synthesize")
+    runParser = subparsers.add_parser("run")
+    runParser.add_argument("--repeat", type=int, default=20)
+    compareParser = subparsers.add_parser("compare")
+    compareParser.add_argument("old")
+    compareParser.add_argument("new")
+    importsParser = subparsers.add_parser("imports")
+    importsParser.add_argument("--repeat", type=int, default=5)
+    importsParser.add_argument("--budget", type=float, default=IMPORT_BUDGET, help="seconds each module may take to import")
+    args = parser.parse_args(argv)
+
+    if(args.command == "record"):
+        recordFixtures()
+    elif(args.command == "synthesize"):
+        synthesizeFixtures()
+    elif(args.command == "run"):
+        runBenchmarks(args.repeat)
+    elif(args.command == "compare"):
+        compareResults(args.old, args.new)
+    elif(args.command == "imports"):
+        return 1 if checkImports(args.repeat, args.budget) else 0
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
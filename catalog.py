@@ -0,0 +1,7 @@
+#kept so "python catalog.py" still works, the code lives in shotchart/catalog.py
+
+import sys
+from shotchart.catalog import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,207 +1,36 @@
+import os
+import time
+import uuid
+import functools
+import flask
 import dash
 import dash_core_components as dcc
 import dash_html_components as html
-from dash.dependencies import Input, Output, State
+from dash.dependencies import Input, Output, State, ClientsideFunction
 import plotly.graph_objs as go
 import plotly.io as pio
-from nba_api.stats.static import players
-from nba_api.stats.endpoints.shotchartdetail import ShotChartDetail
-import datetime
+from shotchart.playerindex import findPlayer, findTeam, normalizeName, suggestPlayers
+from concurrent.futures import ThreadPoolExecutor
+from shotchart.statshttp import UpstreamError
+from shotchart.shotcache import getShotData, getSeasonsData, isCached, cachePath, isFinishedSeason, seasonString, CURRENT_SEASON_TTL, MAX_WORKERS
+from shotchart.figurecache import FigureCache
+from shotchart.catalog import isValidSeason, playerHasSeason
+from shotchart.seasons import seasonStartYear
+from shotchart.shotfigure import chartTraces, relativeTrace, seasonGridFigure, courtFigure, WEBGL_THRESHOLD
+from shotchart.leaguebaseline import relativeBins, MissingBaselineError, LEAGUE_PLAYER_ID
+from shotchart.shotraster import densityImage, visibleRange, COURT_RANGE
+from shotchart import metrics
+from shotchart.figurepayload import compactFigure, figureUpdate, useFastJson, shotArrays
 
 pio.templates.default= "none"
+useFastJson()
 
-court_shapes = []
- 
-outer_lines_shape = dict(
-    type='rect',
-    xref='x',
-    yref='y',
-    x0='-250',
-    y0='-47.5',
-    x1='250',
-    y1='422.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)
- 
-court_shapes.append(outer_lines_shape)
-
-hoop_shape = dict(
-    type='circle',
-    xref='x',
-    yref='y',
-    x0='7.5',
-    y0='7.5',
-    x1='-7.5',
-    y1='-7.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)
- 
-court_shapes.append(hoop_shape)
-
-backboard_shape = dict(
-    type='rect',
-    xref='x',
-    yref='y',
-    x0='-30',
-    y0='-7.5',
-    x1='30',
-    y1='-6.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    ),
-    fillcolor='rgba(10, 10, 10, 1)'
-)
- 
-court_shapes.append(backboard_shape)
-
-outer_three_sec_shape = dict(
-    type='rect',
-    xref='x',
-    yref='y',
-    x0='-80',
-    y0='-47.5',
-    x1='80',
-    y1='143.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)
- 
-court_shapes.append(outer_three_sec_shape)
-
-inner_three_sec_shape = dict(
-    type='rect',
-    xref='x',
-    yref='y',
-    x0='-60',
-    y0='-47.5',
-    x1='60',
-    y1='143.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)
- 
-court_shapes.append(inner_three_sec_shape)
-
-left_line_shape = dict(
-    type='line',
-    xref='x',
-    yref='y',
-    x0='-220',
-    y0='-47.5',
-    x1='-220',
-    y1='92.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)
- 
-court_shapes.append(left_line_shape)
-
-right_line_shape = dict(
-    type='line',
-    xref='x',
-    yref='y',
-    x0='220',
-    y0='-47.5',
-    x1='220',
-    y1='92.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)   
- 
-court_shapes.append(right_line_shape)
-
-three_point_arc_shape = dict(
-    type='path',
-    xref='x',
-    yref='y',
-    path='M -220 92.5 C -70 300, 70 300, 220 92.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)
- 
-court_shapes.append(three_point_arc_shape)
-
-center_circle_shape = dict(
-    type='circle',
-    xref='x',
-    yref='y',
-    x0='60',
-    y0='482.5',
-    x1='-60',
-    y1='362.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)
- 
-court_shapes.append(center_circle_shape)
-
-res_circle_shape = dict(
-    type='circle',
-    xref='x',
-    yref='y',
-    x0='20',
-    y0='442.5',
-    x1='-20',
-    y1='402.5',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)
- 
-court_shapes.append(res_circle_shape)
-
-free_throw_circle_shape = dict(
-    type='circle',
-    xref='x',
-    yref='y',
-    x0='60',
-    y0='200',
-    x1='-60',
-    y1='80',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1
-    )
-)
- 
-court_shapes.append(free_throw_circle_shape)
-
-res_area_shape = dict(
-    type='circle',
-    xref='x',
-    yref='y',
-    x0='40',
-    y0='40',
-    x1='-40',
-    y1='-40',
-    line=dict(
-        color='rgba(10, 10, 10, 1)',
-        width=1,
-        dash='dot'
-    )
-)
- 
-court_shapes.append(res_area_shape)
+renderer = "auto" #"auto" switches to webgl above shotfigure.WEBGL_THRESHOLD markers
+figureCache = FigureCache()
+careerExecutor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+careerJobs = {} #job id -> (started, {season: future}) for the career fetches started by this worker
+MAX_CAREER_SEASONS = 25
+CAREER_TIMEOUT = float(os.environ.get("SHOTCHART_CAREER_TIMEOUT", 120)) #seconds before seasons still missing are drawn as failed and polling stops
 
 external_stylesheets = ['https://codepen.io/chriddyp/pen/bWLwgP.css']
 
@@ -216,25 +45,7 @@ app.layout = html.Div([
     html.Div([
         dcc.Graph(
             id='shot-graph',
-            figure={
-                'layout': go.Layout( 
-                    title="test",
-                    shapes= court_shapes,
-                    height=800,
-                    xaxis= dict(
-                        showgrid=False,
-                        range=[-300, 300],
-                        showticklabels=False,
-                        zeroline=False
-                    ),
-                    yaxis= dict(
-                        showgrid=False,
-                        range=[-100, 500],
-                        showticklabels=False,
-                        zeroline=False
-                    )
-                )
-            },
+            figure=courtFigure("test"), #same base layout update_figure builds, so updates can leave it out
             config={
                 'displayModeBar': False,
                 'staticPlot': True
@@ -242,149 +53,387 @@ app.layout = html.Div([
         ),
     ]),#,style = {'margin': 'auto', 'width': '50%'}), #need 'width': '50%' for some reason. Could use margin-left to "center" this too
     html.Div([
-            dcc.Input(id='playerName-state', type='text', value='Brook Lopez'),
+            dcc.Input(id='playerName-state', type='text', value='Brook Lopez', list='player-suggestions', autoComplete='off'),
+            html.Datalist(id='player-suggestions'),
             dcc.Input(id='season-state', type='text', value='2018-19'),
+            dcc.Dropdown(
+                id='chartMode-state',
+                options=[
+                    {'label': 'Every shot', 'value': 'shots'},
+                    {'label': 'Hex bins', 'value': 'hex'},
+                    {'label': 'Square bins', 'value': 'square'},
+                    {'label': 'Hex vs league', 'value': 'relative'}
+                ],
+                value='shots',
+                clearable=False,
+                style={'width': '150px'}
+            ),
             html.Button('Submit', id='button')
-    ],style = {"width": "100%", "display": "flex", "align-items": "center", "justify-content": "center"})
+    ],style = {"width": "100%", "display": "flex", "align-items": "center", "justify-content": "center"}),
+    html.Div([
+            dcc.Input(id='career-playerName-state', type='text', value='Brook Lopez', list='player-suggestions', autoComplete='off'),
+            dcc.Input(id='career-startSeason-state', type='text', value='2014-15'),
+            dcc.Input(id='career-endSeason-state', type='text', value='2018-19'),
+            html.Button('Show seasons', id='career-button')
+    ],style = {"width": "100%", "display": "flex", "align-items": "center", "justify-content": "center"}),
+    html.Div([
+        dcc.Graph(
+            id='career-graph',
+            figure={'layout': go.Layout(height=100, xaxis=dict(visible=False), yaxis=dict(visible=False))},
+            config={
+                'displayModeBar': False,
+                'staticPlot': True
+            }
+        ),
+        dcc.Interval(id='career-interval', interval=500, disabled=True), #polls the running fetches, off while nothing is loading
+        dcc.Store(id='career-job')
+    ]),
+    html.Div([
+            dcc.Input(id='explorer-playerName-state', type='text', value='Brook Lopez', list='player-suggestions', autoComplete='off'),
+            dcc.Input(id='explorer-startSeason-state', type='text', value='2014-15'),
+            dcc.Input(id='explorer-endSeason-state', type='text', value='2018-19'),
+            html.Button('Load shots', id='explorer-button')
+    ],style = {"width": "100%", "display": "flex", "align-items": "center", "justify-content": "center"}),
+    html.Div([
+            dcc.Checklist(
+                id='explorer-results',
+                options=[
+                    {'label': 'Made', 'value': 'made'},
+                    {'label': 'Missed', 'value': 'missed'}
+                ],
+                value=['made', 'missed'],
+                labelStyle={'display': 'inline-block'}
+            ),
+            dcc.Dropdown(id='explorer-seasons', multi=True, placeholder='Seasons', style={'width': '400px'}),
+            dcc.Dropdown(id='explorer-zones', multi=True, placeholder='Zones', style={'width': '400px'})
+    ],style = {"width": "100%", "display": "flex", "align-items": "center", "justify-content": "center"}),
+    html.Div([
+        dcc.Graph(
+            id='explorer-graph',
+            figure=courtFigure(None),
+            config={
+                'displayModeBar': False,
+                'staticPlot': True
+            }
+        ),
+        dcc.Store(id='explorer-data') #every loaded shot, the filters below only ever read it in the browser
+    ]),
+    html.Div([
+            dcc.Input(id='team-name-state', type='text', value='Milwaukee Bucks'), #a team name, nickname, city or abbreviation, or "league"
+            dcc.Input(id='team-season-state', type='text', value='2018-19'),
+            html.Button('Show team', id='team-button')
+    ],style = {"width": "100%", "display": "flex", "align-items": "center", "justify-content": "center"}),
+    html.Div([
+        dcc.Graph(
+            id='team-graph',
+            figure=courtFigure(None),
+            config={
+                'displayModeBar': False,
+                'scrollZoom': True #zooming and panning ask the server for a sharper image of the new window
+            }
+        ),
+        dcc.Store(id='team-view')
+    ])
 ])
 
+def timedCallback(function): #the callback's own time, recordRequestTime counts the rest of the request as serialization
+    @functools.wraps(function)
+    def wrapper(*args):
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            seconds = time.perf_counter() - start
+            metrics.observe("callback", seconds)
+            flask.g.callbackSeconds = seconds
+    return wrapper
+
+@app.server.before_request
+def startRequestTimer():
+    flask.g.requestStart = time.perf_counter()
+
+@app.server.after_request
+def recordRequestTime(response):
+    if(flask.request.path.endswith('_dash-update-component') and 'requestStart' in flask.g):
+        seconds = time.perf_counter() - flask.g.requestStart
+        metrics.observe("request", seconds)
+        if('callbackSeconds' in flask.g):
+            metrics.observe("serialize", seconds - flask.g.callbackSeconds)
+    return response
+
+@app.server.route('/metrics')
+def serveMetrics():
+    return flask.Response(metrics.renderMetrics(), mimetype='text/plain; version=0.0.4')
+
+@app.callback(
+    Output('player-suggestions', 'children'),
+    [Input('playerName-state', 'value')]
+)
+def update_suggestions(playerName):
+    return [html.Option(value=player['full_name']) for player in suggestPlayers(playerName)]
+
 @app.callback(
     Output('shot-graph', 'figure'),
     [Input('button', 'n_clicks')],
     state=[
         State(component_id='playerName-state', component_property='value'),
-        State(component_id='season-state', component_property='value')]
+        State(component_id='season-state', component_property='value'),
+        State(component_id='chartMode-state', component_property='value')]
 )
-def update_figure(n_clicks, playerName, season):
+@timedCallback
+def update_figure(n_clicks, playerName, season, chartMode):
+    season = str(season).strip()
     try:
-        playerID = players.find_players_by_full_name(str(playerName))[0]['id']
-        shotchart_detail = ShotChartDetail(team_id = 0, player_id = playerID, season_nullable= str(season), context_measure_simple= "FGA")
-        shotData = shotchart_detail.get_data_frames()[0]
+        with metrics.timed("lookup"):
+            player = findPlayer(str(playerName))
+        if(player is None): #unknown or badly misspelled names never reach stats.nba.com
+            raise IndexError
+        playerID = player['id']
+        playerName = player['full_name'] #show the corrected spelling in the title
+        if(not playerHasSeason(playerID, season)): #bad seasons are caught from the catalog before any download
+            raise ValueError
+        cacheKey = (playerID, str(season), chartMode, renderer)
+        cachedFig = figureCache.get(cacheKey)
+        if(cachedFig is not None):
+            return figureUpdate(cachedFig)
+        with metrics.timed("fetch"):
+            shotData = getShotData(playerID, str(season))
+        if(len(shotData) == 0): #the player was on a roster but took no shots that season
+            raise ValueError
 
-        seasonFirst = season[2:4]
-        if(int(seasonFirst) < 0 or int(seasonFirst) < 13 or int(seasonFirst) > (datetime.datetime.now().year % 100) or len(shotData) == 0): #check to see if a bad season has been entered even if formatting is fine
-                raise ValueError
+        if(chartMode == "relative"): #joined with the league table before the flip, both are binned in stats.nba.com's orientation
+            with metrics.timed("baseline"):
+                try:
+                    bins = relativeBins(shotData, season)
+                except(MissingBaselineError): #built by leaguebaseline.py, never inside a request
+                    return courtFigure('Error: No league average for the %s NBA season yet' % season)
+                bins["LOC_X"] *= -1
+            traces = [relativeTrace(bins)]
+        else:
+            with metrics.timed("dataframe"):
+                shotData["LOC_X"] *= -1
+            traces = None
+        with metrics.timed("figure"):
+            fig = courtFigure('Shots by %s in the %s NBA season' % (playerName, season))
+            fig.add_traces(traces if traces is not None else chartTraces(shotData, chartMode, renderer))
 
-        shotData["LOC_X"] *= -1
-        made_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 1]
-        missed_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 0]
+        payload = figureCache.put(cacheKey, compactFigure(fig), ttl=None if isFinishedSeason(season) else CURRENT_SEASON_TTL) #the in-progress season expires with its shot data
+        return figureUpdate(payload)
+    except(IndexError): #goes here if playerID fails
+        if(not isValidSeason(season)): #checked offline instead of downloading a season just to see if it exists
+            return courtFigure('Error: Invalid input for both player name and season year')
+        return courtFigure('Error: Invalid input for player name')
+    except(UpstreamError): #stats.nba.com failed even after retrying, the input itself may be fine
+        return courtFigure('Error: stats.nba.com is not responding, try again in a minute')
+    except(ValueError): #goes here is player formatting is fine but season formatting is wrong
+        return courtFigure('Error: Invalid input for season year')
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=made_shots["LOC_X"], y=made_shots["LOC_Y"], mode='markers', marker_color="BLUE", name="Made Shot"))
-        fig.add_trace(go.Scatter(x=missed_shots["LOC_X"], y=missed_shots["LOC_Y"], mode='markers', marker_color="RED", name="Missed Shot"))
-        
-        layout = go.Layout(
-            title='Shots by %s in the %s NBA season' % (playerName, season), 
-            showlegend=False,
-            xaxis=dict(
-                showgrid=False,
-                range=[-300, 300],
-                showticklabels=False,
-                zeroline=False
-            ),
-            yaxis=dict(
-                showgrid=False,
-                range=[-100, 500],
-                showticklabels=False,
-                zeroline=False
-            ),
-            height=800,
-            shapes=court_shapes,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            hovermode=False
-        )
-        fig.update(layout=layout)
+def errorFigure(title):
+    fig = go.Figure()
+    fig.update_layout(title=title, height=100, xaxis=dict(visible=False), yaxis=dict(visible=False), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+    return fig
 
-        return fig
-    except(IndexError): #goes here if playerID fails
-        fig = go.Figure()
+def dropCareerJob(jobID):
+    started, futures = careerJobs.pop(jobID, (None, {}))
+    for future in futures.values():
+        future.cancel() #seasons still queued are not fetched, running ones finish into the shot cache
 
-        try: #goes here if season formatting is fine
-            playerID = players.find_players_by_full_name(str("Lebron James"))[0]['id']
-            shotchart_detail = ShotChartDetail(team_id = 0, player_id = playerID, season_nullable= str(season), context_measure_simple= "FGA")
-            shotData = shotchart_detail.get_data_frames()[0]
-            
-            seasonFirst = season[2:4]
-            if(int(seasonFirst) < 0 or int(seasonFirst) < 13 or int(seasonFirst) > (datetime.datetime.now().year % 100) or len(shotData) == 0): #check to see if a bad season has been entered even if formatting is fine
-                raise ValueError
-            
-            layout = go.Layout(
-                title='Error: Invalid input for player name', 
-                showlegend=False,
-                xaxis=dict(
-                    showgrid=False,
-                    range=[-300, 300],
-                    showticklabels=False,
-                    zeroline=False
-                ),
-                yaxis=dict(
-                    showgrid=False,
-                    range=[-100, 500],
-                    showticklabels=False,
-                    zeroline=False
-                ),
-                height=800,
-                shapes=court_shapes,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                hovermode=False
-            )
-            fig.update(layout=layout)
+def playerSeasonRange(playerName, startSeason, endSeason): #(player, seasons, None), or (None, None, error title) for bad input
+    player = findPlayer(str(playerName))
+    if(player is None):
+        return None, None, 'Error: Invalid input for player name'
+    startSeason = str(startSeason).strip()
+    endSeason = str(endSeason).strip()
+    if(not isValidSeason(startSeason) or not isValidSeason(endSeason) or startSeason > endSeason):
+        return None, None, 'Error: Invalid input for season range'
+    seasons = [seasonString(year) for year in range(seasonStartYear(startSeason), seasonStartYear(endSeason)+1)]
+    seasons = [season for season in seasons if playerHasSeason(player['id'], season)][-MAX_CAREER_SEASONS:] #a career this long is cut to its latest seasons
+    if(not seasons):
+        return None, None, 'Error: %s has no seasons in that range' % player['full_name']
+    return player, seasons, None
 
-            return fig
-        except(ValueError):#goes here is season formatting is incorrect also
-            layout = go.Layout(
-                title='Error: Invalid input for both player name and season year', 
-                showlegend=False,
-                xaxis=dict(
-                    showgrid=False,
-                    range=[-300, 300],
-                    showticklabels=False,
-                    zeroline=False
-                ),
-                yaxis=dict(
-                    showgrid=False,
-                    range=[-100, 500],
-                    showticklabels=False,
-                    zeroline=False
-                ),
-                height=800,
-                shapes=court_shapes,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                hovermode=False
-            )
-            fig.update(layout=layout)
+def startCareerJob(playerID, seasons, previousJobID=None):
+    if(previousJobID is not None): #a new click replaces the job the page was showing
+        dropCareerJob(previousJobID)
+    now = time.time()
+    for jobID in [jobID for jobID, (started, futures) in list(careerJobs.items()) if now - started > CAREER_TIMEOUT]: #jobs whose page was closed are never polled to the end
+        dropCareerJob(jobID)
+    jobID = uuid.uuid4().hex
+    careerJobs[jobID] = (now, {season: careerExecutor.submit(getShotData, playerID, season) for season in seasons})
+    return jobID, now
 
-            return fig
+def careerArrived(job): #seasons whose fetch has finished, checked without reading any shot data
+    futures = careerJobs.get(job['id'], (None, {}))[1]
+    arrived = []
+    for season in job['seasons']:
+        future = futures.get(season)
+        if(future.done() if future is not None else isCached(job['player_id'], season)): #a job started by another worker lands in the shared shot cache
+            arrived.append(season)
+    return arrived
 
-    except(ValueError): #goes here is player formatting is fine but season formatting is wrong
-        fig = go.Figure()
-        layout = go.Layout(
-            title='Error: Invalid input for season year', 
-            showlegend=False,
-            xaxis=dict(
-                showgrid=False,
-                range=[-300, 300],
-                showticklabels=False,
-                zeroline=False
-            ),
-            yaxis=dict(
-                showgrid=False,
-                range=[-100, 500],
-                showticklabels=False,
-                zeroline=False
-            ),
-            height=800,
-            shapes=court_shapes,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            hovermode=False
-        )
-        fig.update(layout=layout)
+def careerFrames(job, seasons): #the shot data of seasons that have arrived, None for seasons whose fetch failed
+    futures = careerJobs.get(job['id'], (None, {}))[1]
+    frames = {}
+    for season in seasons:
+        future = futures.get(season)
+        if(future is not None):
+            frames[season] = future.result() if future.exception() is None else None
+        else:
+            frames[season] = getShotData(job['player_id'], season)
+    return frames
+
+@app.callback(
+    [Output('career-graph', 'figure'),
+    Output('career-interval', 'disabled'),
+    Output('career-job', 'data')],
+    [Input('career-button', 'n_clicks'),
+    Input('career-interval', 'n_intervals')],
+    state=[
+        State(component_id='career-playerName-state', component_property='value'),
+        State(component_id='career-startSeason-state', component_property='value'),
+        State(component_id='career-endSeason-state', component_property='value'),
+        State(component_id='career-job', component_property='data')]
+)
+@timedCallback
+def update_career(n_clicks, n_intervals, playerName, startSeason, endSeason, job):
+    triggered = [t['prop_id'] for t in dash.callback_context.triggered]
+    if('career-button.n_clicks' in triggered): #a new request starts the fetches and returns straight away
+        if(n_clicks is None):
+            raise dash.exceptions.PreventUpdate
+        player, seasons, error = playerSeasonRange(playerName, startSeason, endSeason)
+        if(error is not None):
+            return errorFigure(error), True, None
+        jobID, started = startCareerJob(player['id'], seasons, job['id'] if job else None)
+        job = {'id': jobID, 'started': started, 'player_id': player['id'], 'name': player['full_name'], 'seasons': seasons}
+        return compactFigure(seasonGridFigure('Shots by %s from %s to %s' % (job['name'], seasons[0], seasons[-1]), seasons, {})), False, job
 
-        return fig
+    if(job is None):
+        raise dash.exceptions.PreventUpdate
+    arrived = careerArrived(job)
+    done = len(arrived) == len(job['seasons'])
+    timedOut = not done and time.time() - job['started'] > CAREER_TIMEOUT #a fetch that failed on another worker never reaches the shared cache
+    if(not done and not timedOut and len(arrived) == job.get('shown', 0)): #nothing new arrived since the last tick, so nothing is read
+        return dash.no_update, False, dash.no_update
+    job['shown'] = len(arrived)
+    frames = careerFrames(job, arrived)
+    if(timedOut):
+        frames.update({season: None for season in job['seasons'] if season not in frames})
+        done = True
+    if(done):
+        dropCareerJob(job['id'])
+    title = 'Shots by %s from %s to %s' % (job['name'], job['seasons'][0], job['seasons'][-1])
+    failed = [season for season, shotData in frames.items() if shotData is None]
+    if(done and failed):
+        title = '%s (failed to load %d of %d seasons)' % (title, len(failed), len(job['seasons']))
+    fig = seasonGridFigure(title, job['seasons'], frames)
+    return compactFigure(fig), done, None if done else job
+
+@app.callback(
+    Output('explorer-data', 'data'),
+    [Input('explorer-button', 'n_clicks')],
+    state=[
+        State(component_id='explorer-playerName-state', component_property='value'),
+        State(component_id='explorer-startSeason-state', component_property='value'),
+        State(component_id='explorer-endSeason-state', component_property='value')]
+)
+@timedCallback
+def load_explorer(n_clicks, playerName, startSeason, endSeason): #the only server round trip of the explorer, made once per player
+    if(n_clicks is None):
+        raise dash.exceptions.PreventUpdate
+    player, seasons, error = playerSeasonRange(playerName, startSeason, endSeason)
+    if(error is not None):
+        return {'error': error}
+    try:
+        with metrics.timed("fetch"):
+            frames = getSeasonsData(player['id'], seasons)
+    except(UpstreamError):
+        return {'error': 'Error: stats.nba.com is not responding, try again in a minute'}
+
+    zones = []
+    data = {}
+    with metrics.timed("dataframe"):
+        for season, shotData in zip(seasons, frames):
+            if(len(shotData) == 0):
+                continue
+            shotData["LOC_X"] *= -1
+            data[season] = shotArrays(shotData, zones)
+    if(not data):
+        return {'error': 'Error: %s took no shots in that range' % player['full_name']}
+    return {'name': player['full_name'], 'seasons': data, 'zones': zones, 'webglThreshold': WEBGL_THRESHOLD}
+
+app.clientside_callback(
+    ClientsideFunction(namespace='explorer', function_name='options'), #assets/explorer.js
+    [Output('explorer-seasons', 'options'),
+    Output('explorer-seasons', 'value'),
+    Output('explorer-zones', 'options'),
+    Output('explorer-zones', 'value')],
+    [Input('explorer-data', 'data')]
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='explorer', function_name='figure'),
+    Output('explorer-graph', 'figure'),
+    [Input('explorer-data', 'data'),
+    Input('explorer-results', 'value'),
+    Input('explorer-seasons', 'value'),
+    Input('explorer-zones', 'value')],
+    [State('explorer-graph', 'figure')]
+)
+
+@functools.lru_cache(maxsize=8)
+def teamShotArrays(teamID, season, version): #drawn coordinates of a team or league season, version is the shot file's mtime
+    shotData = getShotData(LEAGUE_PLAYER_ID, season, teamID=teamID)
+    return -shotData["LOC_X"].to_numpy(dtype='float32'), shotData["LOC_Y"].to_numpy(dtype='float32')
+
+def teamShots(teamID, season):
+    if(not isCached(LEAGUE_PLAYER_ID, season, teamID=teamID)):
+        getShotData(LEAGUE_PLAYER_ID, season, teamID=teamID)
+    return teamShotArrays(teamID, season, os.path.getmtime(cachePath(LEAGUE_PLAYER_ID, season, teamID=teamID)))
+
+@app.callback(
+    [Output('team-graph', 'figure'),
+    Output('team-view', 'data')],
+    [Input('team-button', 'n_clicks'),
+    Input('team-graph', 'relayoutData')],
+    state=[
+        State(component_id='team-name-state', component_property='value'),
+        State(component_id='team-season-state', component_property='value'),
+        State(component_id='team-view', component_property='data')]
+)
+@timedCallback
+def update_team(n_clicks, relayoutData, teamName, season, view):
+    triggered = [t['prop_id'] for t in dash.callback_context.triggered]
+    if('team-button.n_clicks' in triggered):
+        if(n_clicks is None):
+            raise dash.exceptions.PreventUpdate
+        season = str(season).strip()
+        if(normalizeName(teamName) in ('league', 'nba')):
+            team = {'id': 0, 'full_name': 'the NBA'}
+        else:
+            team = findTeam(str(teamName))
+        if(team is None):
+            return courtFigure('Error: Invalid input for team name'), None
+        if(not isValidSeason(season)):
+            return courtFigure('Error: Invalid input for season year'), None
+        view = {'team_id': team['id'], 'name': team['full_name'], 'season': season, 'range': COURT_RANGE}
+    else:
+        if(view is None):
+            raise dash.exceptions.PreventUpdate
+        window = visibleRange(relayoutData, view['range'])
+        if(list(map(list, window)) == list(map(list, view['range']))): #our own redraw, or a relayout that moved nothing
+            raise dash.exceptions.PreventUpdate
+        view = dict(view, range=window)
+
+    try:
+        with metrics.timed("fetch"):
+            x, y = teamShots(view['team_id'], view['season'])
+    except(UpstreamError):
+        return courtFigure('Error: stats.nba.com is not responding, try again in a minute'), None
+    xRange, yRange = view['range']
+    with metrics.timed("raster"):
+        image = densityImage(x, y, xRange, yRange)
+    title = 'Shot density for %s in the %s NBA season (%d shots)' % (view['name'], view['season'], len(x))
+    return courtFigure(title, xRange, yRange, [image]), view
 
 if __name__ == '__main__':
     app.run_server(debug=True)
\ No newline at end of file
@@ -0,0 +1,129 @@
+#renders shot charts to image files for many players at once, skipping every chart whose data and options have not changed since the last run
+#python exportcharts.py 2018-19 --format png --workers 4
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from shotchart.playerindex import findPlayer
+from shotchart.shotcache import getShotData
+from shotchart.shotfigure import shotChartFigure
+from shotchart.catalog import playerHasSeason
+
+MANIFEST_NAME = "manifest.json" #chart file name -> hash of the data and options it was rendered from
+
+def chartHash(shotData, options):
+    import pandas as pd
+    digest = hashlib.sha1(pd.util.hash_pandas_object(shotData, index=False).to_numpy().tobytes())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def chartFileName(player, season, options):
+    return "%s_%s_%s.%s" % (player['id'], season, options['chartMode'], options['format'])
+
+def renderChart(player, season, options, path):
+    start = time.time()
+    try:
+        shotData = getShotData(player['id'], season)
+        fig = shotChartFigure(shotData, 'Shots by %s in the %s NBA season' % (player['full_name'], season), options['chartMode'], "svg", options['height'], options['width']) #static engines draw svg markers, webgl buys nothing here
+        tmpPath = "%s.%d.tmp.%s" % (path, os.getpid(), options['format'])
+        fig.write_image(tmpPath, format=options['format'], scale=options['scale'])
+        os.replace(tmpPath, path)
+        return path, None, time.time() - start
+    except Exception as e: #one broken chart must not stop the batch
+        return path, "%s: %s" % (type(e).__name__, e), time.time() - start
+
+def readManifest(outDir):
+    try:
+        with open(os.path.join(outDir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def writeManifest(outDir, manifest):
+    path = os.path.join(outDir, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def exportCharts(playerList, season, outDir, chartMode="shots", fmt="png", workers=4, width=1000, height=800, scale=1, force=False):
+    options = {'chartMode': chartMode, 'format': fmt, 'width': width, 'height': height, 'scale': scale}
+    os.makedirs(outDir, exist_ok=True)
+    manifest = readManifest(outDir)
+
+    jobs = []
+    skipped = 0
+    failures = []
+    for player in playerList:
+        if(not playerHasSeason(player['id'], season)):
+            continue
+        try:
+            shotData = getShotData(player['id'], season)
+        except Exception as e:
+            failures.append((player['id'], "%s: %s" % (type(e).__name__, e)))
+            continue
+        if(len(shotData) == 0):
+            continue
+        fileName = chartFileName(player, season, options)
+        path = os.path.join(outDir, fileName)
+        digest = chartHash(shotData, options)
+        if(not force and manifest.get(fileName) == digest and os.path.exists(path)): #nothing changed since the last render
+            skipped += 1
+            continue
+        jobs.append((player, path, fileName, digest))
+
+    print("%d charts to render, %d unchanged" % (len(jobs), skipped))
+    start = time.time()
+    rendered = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(renderChart, player, season, options, path): (fileName, digest) for player, path, fileName, digest in jobs}
+        for future in as_completed(futures):
+            fileName, digest = futures[future]
+            path, error, seconds = future.result()
+            if(error is None):
+                manifest[fileName] = digest
+                rendered += 1
+            else:
+                failures.append((fileName, error))
+    writeManifest(outDir, manifest)
+
+    elapsed = time.time() - start
+    print("rendered %d charts in %.1fs, %.2f charts/s, %d unchanged, %d failed" % (rendered, elapsed, rendered / max(elapsed, 1e-9), skipped, len(failures)))
+    for name, error in failures:
+        print("  %s %s" % (name, error))
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render shot charts to image files")
+    parser.add_argument("season", help="season like 2018-19")
+    parser.add_argument("--players", nargs="*", help="player names, every active player when left out")
+    parser.add_argument("--out", default="charts")
+    parser.add_argument("--format", default="png", choices=["png", "svg", "jpeg", "webp", "pdf"])
+    parser.add_argument("--chart-mode", default="shots", choices=["shots", "hex", "square"])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--force", action="store_true", help="render every chart even if it has not changed")
+    args = parser.parse_args(argv)
+
+    if(args.players):
+        playerList = []
+        for name in args.players:
+            player = findPlayer(name)
+            if(player is None):
+                print("no player found for %r" % name)
+                return 1
+            playerList.append(player)
+    else:
+        from nba_api.stats.static import players
+        playerList = players.get_active_players()
+
+    failures = exportCharts(playerList, args.season, args.out, args.chart_mode, args.format, args.workers, args.width, args.height, args.scale, args.force)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,7 @@
+#kept so "python leaguebaseline.py" still works, the code lives in shotchart/leaguebaseline.py
+
+import sys
+from shotchart.leaguebaseline import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#one import for scripts, workers and notebooks: the fetch, transform and render functions of the modules in this package
+#nothing is imported until a name is first used, so "import shotchart" costs no pandas, plotly or nba_api and never fetches
+#
+#   import shotchart
+#   shots = shotchart.getShotData(shotchart.getPlayerID("Brook Lopez"), "2018-19")
+#   shotchart.shotChartFigure(shots, "Brook Lopez 2018-19").show()
+
+import importlib
+
+#name -> submodule it lives in
+FETCH = {
+    "getShotData": "shotcache",
+    "getSeasonsData": "shotcache",
+    "refreshShotData": "shotcache",
+    "isCached": "shotcache",
+    "clearCache": "shotcache",
+    "seasonString": "seasons",
+    "currentSeason": "seasons",
+    "getPlayerID": "playerindex",
+    "findPlayer": "playerindex",
+    "findTeam": "playerindex",
+    "suggestPlayers": "playerindex",
+    "playerHasSeason": "catalog",
+    "playerSeasons": "catalog",
+    "isValidSeason": "catalog",
+    "setTransport": "transport",
+    "UpstreamError": "statshttp",
+}
+
+TRANSFORM = {
+    "compactShots": "shotstore",
+    "ShotStore": "shotstore",
+    "binShots": "shotbins",
+    "classifyShots": "shotzones",
+    "zoneEfficiency": "shotzones",
+    "getZoneEfficiency": "shotzones",
+    "getZoneBaseline": "leaguebaseline",
+    "getGridBaseline": "leaguebaseline",
+    "relativeZones": "leaguebaseline",
+    "relativeBins": "leaguebaseline",
+}
+
+RENDER = {
+    "shotChartFigure": "shotfigure",
+    "seasonGridFigure": "shotfigure",
+    "seasonSliderFigure": "shotfigure",
+    "chartTraces": "shotfigure",
+    "relativeTrace": "shotfigure",
+    "getCourtShapes": "courtshapes",
+    "densityImage": "shotraster",
+    "compactFigure": "figurepayload",
+}
+
+_exports = {**FETCH, **TRANSFORM, **RENDER}
+
+__all__ = sorted(_exports)
+
+def __getattr__(name):
+    moduleName = _exports.get(name)
+    if(moduleName is None):
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module("." + moduleName, __name__), name)
+    globals()[name] = value #later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
@@ -0,0 +1,77 @@
+#offline catalog of which seasons have shot data and which players played in them, checked before any network request
+#build or refresh it with: python catalog.py
+
+import os
+import sys
+import json
+import threading
+import datetime
+from .seasons import seasonString, seasonStartYear, currentSeasonStartYear
+
+FIRST_SHOT_SEASON = 1996 #stats.nba.com has shot locations from the 1996-97 season on
+CATALOG_PATH = os.environ.get("SHOTCHART_CATALOG", os.path.abspath("catalog.json")) #in the directory the app or cli runs from, like the shot cache
+
+_catalog = None
+_catalogLock = threading.Lock()
+
+def isValidSeason(season):
+    year = seasonStartYear(season)
+    return year is not None and FIRST_SHOT_SEASON <= year <= currentSeasonStartYear()
+
+def getCatalog():
+    global _catalog
+    if(_catalog is None):
+        with _catalogLock:
+            if(_catalog is None):
+                try:
+                    with open(CATALOG_PATH) as f:
+                        data = json.load(f)
+                    _catalog = {int(playerID): (fromYear, toYear) for playerID, (fromYear, toYear) in data["players"].items()}
+                except (OSError, ValueError, KeyError):
+                    _catalog = {} #without a catalog only the season itself can be checked
+    return _catalog
+
+def playerHasSeason(playerID, season):
+    if(not isValidSeason(season)):
+        return False
+    years = getCatalog().get(int(playerID))
+    if(years is None): #only players newer than the catalog are missing from it, they are let through
+        return True
+    fromYear, toYear = years
+    return fromYear <= seasonStartYear(season) <= toYear
+
+def playerSeasons(playerID):
+    years = getCatalog().get(int(playerID))
+    if(years is None):
+        return []
+    fromYear, toYear = years
+    return [seasonString(year) for year in range(max(fromYear, FIRST_SHOT_SEASON), min(toYear, currentSeasonStartYear())+1)]
+
+def buildCatalog(path=CATALOG_PATH):
+    from nba_api.stats.endpoints.commonallplayers import CommonAllPlayers
+    global _catalog
+
+    allPlayers = CommonAllPlayers(is_only_current_season=0).get_data_frames()[0]
+    playersByID = {}
+    for row in allPlayers.itertuples(): #careers that ended before shot tracking are kept too, so their seasons are turned down offline
+        playersByID[str(row.PERSON_ID)] = [int(row.FROM_YEAR), int(row.TO_YEAR)]
+
+    data = {
+        "built": datetime.datetime.now().isoformat(timespec="seconds"),
+        "first_season": FIRST_SHOT_SEASON,
+        "players": playersByID
+    }
+    tmpPath = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmpPath, "w") as f:
+        json.dump(data, f)
+    os.replace(tmpPath, path)
+    with _catalogLock:
+        _catalog = None
+    return len(playersByID)
+
+def main():
+    print("catalog has %d players" % buildCatalog())
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#bounded lru of finished figures, optionally backed by a directory shared by every worker on the host
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from . import metrics
+
+FIGURE_CACHE_SIZE = int(os.environ.get("SHOTCHART_FIGURE_CACHE_SIZE", 256))
+FIGURE_CACHE_DIR = os.environ.get("SHOTCHART_FIGURE_CACHE_DIR") #unset keeps figures in this process only
+FIGURE_CACHE_DISK_SIZE = int(os.environ.get("SHOTCHART_FIGURE_CACHE_DISK_SIZE", 4096)) #most figure files kept in the directory
+PRUNE_EVERY = 64 #writes between two scans of the directory
+
+class FigureCache:
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE, directory=FIGURE_CACHE_DIR, diskSize=FIGURE_CACHE_DISK_SIZE):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.diskSize = diskSize
+        self.writes = 0
+        self.entries = OrderedDict() #key -> (expires, figure dict), oldest first
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+
+    def diskPath(self, key):
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode()).hexdigest() + ".json")
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if(entry is not None and (entry[0] is None or entry[0] > now)):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                metrics.inc("shotchart_cache_requests_total", cache="figures", result="hit")
+                return entry[1]
+            if(entry is not None):
+                del self.entries[key]
+
+        entry = self.readDisk(key, now)
+        with self.lock:
+            if(entry is None):
+                self.misses += 1
+                metrics.inc("shotchart_cache_requests_total", cache="figures", result="miss")
+                return None
+            self.diskHits += 1
+            metrics.inc("shotchart_cache_requests_total", cache="figures", result="disk_hit")
+            self.store(key, entry)
+        return entry[1]
+
+    def put(self, key, figure, ttl=None): #ttl in seconds, None keeps the figure until it is evicted
+        if(not isinstance(figure, dict)):
+            figure = figure.to_dict()
+        expires = None if ttl is None else time.time() + ttl
+        with self.lock:
+            self.store(key, (expires, figure))
+        self.writeDisk(key, expires, figure)
+        return figure
+
+    def store(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while(len(self.entries) > self.maxsize):
+            self.entries.popitem(last=False)
+
+    def readDisk(self, key, now):
+        if(self.directory is None):
+            return None
+        path = self.diskPath(key)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if(data["expires"] is not None and data["expires"] <= now):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path) #the mtime is the last use, pruneDisk drops the least recently used files
+        except OSError:
+            pass
+        return (data["expires"], data["figure"])
+
+    def writeDisk(self, key, expires, figure):
+        import plotly.io as pio
+        if(self.directory is None):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.diskPath(key)
+        tmpPath = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+        with open(tmpPath, "w") as f:
+            f.write('{"expires": %s, "figure": %s}' % (json.dumps(expires), pio.to_json(figure, validate=False)))
+        os.replace(tmpPath, path)
+        with self.lock:
+            self.writes += 1
+            prune = self.writes % PRUNE_EVERY == 0
+        if(prune):
+            self.pruneDisk()
+
+    def pruneDisk(self): #keeps the directory at diskSize files, every worker sharing it prunes the same way
+        if(self.directory is None):
+            return 0
+        entries = []
+        for fileName in os.listdir(self.directory):
+            if(not fileName.endswith(".json")):
+                continue
+            path = os.path.join(self.directory, fileName)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError: #removed by another worker in the meantime
+                pass
+        if(len(entries) <= self.diskSize):
+            return 0
+        entries.sort()
+        removed = 0
+        for _, path in entries[:len(entries) - self.diskSize]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "disk_hits": self.diskHits, "misses": self.misses, "size": len(self.entries), "maxsize": self.maxsize}
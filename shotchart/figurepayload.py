@@ -0,0 +1,133 @@
+#compact figure payloads for the Dash graph: narrow typed arrays for coordinates, a fast json engine and no repeated layout
+
+import os
+import re
+import base64
+import importlib.util
+import numpy as np
+
+TYPED_DTYPES = {"int8": "i1", "uint8": "u1", "int16": "i2", "uint16": "u2", "int32": "i4", "uint32": "u4", "float32": "f4", "float64": "f8"}
+ARRAY_KEYS = ("x", "y")
+MARKER_ARRAY_KEYS = ("size", "color")
+
+def parseVersion(text):
+    match = re.search(r"(\d+)\.(\d+)\.(\d+)", text)
+    return tuple(int(part) for part in match.groups()) if match else None
+
+def bundledPlotlyVersion(): #version of plotly.js the Dash graph component runs, typed arrays need 2.28 or newer
+    for package, fileName in (("dash_core_components", "plotly.min.js"), ("dash", os.path.join("dcc", "plotly.min.js"))): #dash 1.x ships its own copy
+        try:
+            spec = importlib.util.find_spec(package)
+        except (ImportError, ValueError):
+            continue
+        if(spec is None or spec.origin is None):
+            continue
+        path = os.path.join(os.path.dirname(spec.origin), fileName)
+        try:
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                header = f.read(300)
+        except OSError:
+            continue
+        match = re.search(r"plotly\.js v(\d+\.\d+\.\d+)", header)
+        if(match is not None):
+            return parseVersion(match.group(1))
+    try: #dash 2 and later serve the plotly.js that comes with the plotly package
+        from plotly.offline import get_plotlyjs_version
+        return parseVersion(get_plotlyjs_version())
+    except ImportError:
+        return None
+
+def typedArraysSupported():
+    setting = os.environ.get("SHOTCHART_TYPED_ARRAYS", "auto")
+    if(setting != "auto"):
+        return setting == "1"
+    version = bundledPlotlyVersion()
+    return version is not None and version >= (2, 28, 0)
+
+TYPED_ARRAYS = typedArraysSupported()
+
+def useFastJson(): #orjson encodes numpy and plain lists several times faster than the standard json module
+    import plotly.io as pio
+    if(importlib.util.find_spec("orjson") is not None and hasattr(pio, "json") and hasattr(pio.json, "config")):
+        pio.json.config.default_engine = "orjson"
+        return True
+    return False
+
+def decodeTyped(value):
+    return np.frombuffer(base64.b64decode(value["bdata"]), dtype=np.dtype(value["dtype"]))
+
+def narrowArray(values): #smallest dtype that holds the values exactly, floats are cut to float32
+    array = decodeTyped(values) if isinstance(values, dict) else np.asarray(values)
+    if(array.dtype.kind not in "iuf" or array.ndim != 1):
+        return None
+    if(array.size and array.dtype.kind == "f" and not np.all(np.isfinite(array))):
+        return None
+    if(array.dtype.kind == "f" and np.array_equal(array, np.round(array))):
+        array = array.astype(np.int64)
+    if(array.dtype.kind in "iu"):
+        low = array.min() if array.size else 0
+        high = array.max() if array.size else 0
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if(info.min <= low and high <= info.max):
+                return array.astype(dtype)
+        return None
+    return array.astype(np.float32)
+
+def encodeArray(values, typedArrays):
+    array = narrowArray(values)
+    if(array is None):
+        return values.tolist() if isinstance(values, np.ndarray) else values
+    if(typedArrays or isinstance(values, dict)): #bdata from plotly.py is read by the plotly.js that plotly.py ships, it stays bdata, just narrower
+        return {"dtype": TYPED_DTYPES[array.dtype.name], "bdata": base64.b64encode(array.astype(array.dtype.newbyteorder("<")).tobytes()).decode("ascii")}
+    if(array.dtype.kind == "f"):
+        return [round(float(value), 4) for value in array]
+    return array.tolist()
+
+def compactFigure(fig, typedArrays=None): #fig is a go.Figure or figure dict, returns a plain dict ready to send
+    if(typedArrays is None):
+        typedArrays = TYPED_ARRAYS
+    figure = fig if isinstance(fig, dict) else fig.to_plotly_json()
+    data = []
+    for trace in figure.get("data", []):
+        trace = dict(trace)
+        for key in ARRAY_KEYS:
+            if(key in trace and trace[key] is not None):
+                trace[key] = encodeArray(trace[key], typedArrays)
+        if(isinstance(trace.get("marker"), dict)):
+            marker = dict(trace["marker"])
+            for key in MARKER_ARRAY_KEYS:
+                if(isinstance(marker.get(key), (list, tuple, np.ndarray, dict))):
+                    marker[key] = encodeArray(marker[key], typedArrays)
+            trace["marker"] = marker
+        data.append(trace)
+    layout = dict(figure.get("layout", {}))
+    layout.pop("template", None) #the app runs with the empty "none" template, plotly.js needs nothing sent for it
+    return {"data": data, "layout": layout}
+
+def figureUpdate(figure, baseLayoutKeys=("shapes", "xaxis", "yaxis", "height", "paper_bgcolor", "plot_bgcolor", "hovermode", "showlegend")):
+    import dash
+    if(not hasattr(dash, "Patch")): #dash before 2.9 can only replace the whole figure
+        return figure
+    patch = dash.Patch() #the court and axes are already on the page, send only what changed
+    patch["data"] = figure["data"]
+    for key, value in figure["layout"].items():
+        if(key not in baseLayoutKeys):
+            patch["layout"][key] = value
+    return patch
+
+def shotArrays(shotData, zones): #the columns the browser filters on, zone holds indexes into zones which grows as new zone names show up
+    import pandas as pd
+    if("SHOT_ZONE_BASIC" in shotData.columns):
+        names = shotData["SHOT_ZONE_BASIC"].astype(str)
+    else:
+        names = pd.Series("Unknown", index=shotData.index)
+    for name in names.unique():
+        if(name not in zones):
+            zones.append(name)
+    return {
+        "x": shotData["LOC_X"].astype(int).tolist(),
+        "y": shotData["LOC_Y"].astype(int).tolist(),
+        "made": shotData["SHOT_MADE_FLAG"].astype(int).tolist(),
+        "zone": names.map({name: i for i, name in enumerate(zones)}).astype(int).tolist(),
+    }
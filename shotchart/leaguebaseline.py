@@ -0,0 +1,91 @@
+#league wide zone and grid tables per season, built once from the whole league's shots so relative charts are a local join
+#python leaguebaseline.py 2015 2019
+#nightly: python leaguebaseline.py 2024 2025 (only stale tables are rebuilt, --force rebuilds all of them)
+
+import os
+import sys
+import argparse
+from functools import lru_cache
+from . import shotcache
+from .shotcache import getShotData, isFresh, isSeasonString, CURRENT_SEASON_TTL
+from .seasons import seasonStartYear
+from .shotbins import binShots, BIN_SIZE
+from .shotzones import zoneEfficiency
+
+LEAGUE_PLAYER_ID = 0 #ShotChartDetail with player 0 and team 0 returns every shot of the season
+GRID_MODES = ("hex", "square")
+
+class MissingBaselineError(LookupError): #the tables are only read here, building one is a whole league download
+    pass
+
+def baselinePath(season, table): #table is "zones" or "<mode>_<size>"
+    return os.path.join(shotcache.CACHE_DIR, shotcache.BASELINE_SUBDIR, "season=%s" % season, "%s.parquet" % table)
+
+def gridTable(mode, size):
+    return "%s_%d" % (mode, size)
+
+def buildBaseline(season, sizes=(BIN_SIZE,)): #one league download, every table written from it
+    leagueShots = getShotData(LEAGUE_PLAYER_ID, season) #kept in the shot cache like any player, so rebuilding only refreshes new games
+    tables = {"zones": zoneEfficiency(leagueShots).reset_index()}
+    for mode in GRID_MODES:
+        for size in sizes:
+            tables[gridTable(mode, size)] = binShots(leagueShots, mode, size)
+    for table, frame in tables.items():
+        shotcache.writeShotData(baselinePath(season, table), frame)
+    return len(leagueShots)
+
+@lru_cache(maxsize=256)
+def readBaseline(path, version): #version is the file's mtime, a rebuilt table gets a new entry
+    import pandas as pd
+    return pd.read_parquet(path)
+
+def getBaseline(season, table):
+    if(not isSeasonString(season)):
+        raise ValueError("bad season %r" % season)
+    path = baselinePath(season, table)
+    try:
+        version = os.path.getmtime(path)
+    except(FileNotFoundError):
+        year = seasonStartYear(season)
+        raise MissingBaselineError("no %s baseline for %s, build it with: python leaguebaseline.py %d %d" % (table, season, year, year+1))
+    return readBaseline(path, version).copy() #the cached frame is shared, a stale table is still served until the next build
+
+def getZoneBaseline(season):
+    return getBaseline(season, "zones").set_index("ZONE")
+
+def getGridBaseline(season, mode="hex", size=BIN_SIZE):
+    return getBaseline(season, gridTable(mode, size))
+
+def relativeZones(zones, season): #zones is a shotzones.zoneEfficiency table, gains the league numbers and the differences to them
+    league = getZoneBaseline(season)
+    relative = zones.join(league[["FG_PCT", "PTS_PER_SHOT", "FREQUENCY"]].add_prefix("LEAGUE_"))
+    relative["FG_PCT_DIFF"] = relative["FG_PCT"] - relative["LEAGUE_FG_PCT"]
+    relative["PTS_PER_SHOT_DIFF"] = relative["PTS_PER_SHOT"] - relative["LEAGUE_PTS_PER_SHOT"]
+    return relative
+
+def relativeBins(shotData, season, mode="hex", size=BIN_SIZE): #shotData as the shot cache returns it, binned on the same lattice as the league table
+    bins = binShots(shotData, mode, size)
+    league = getGridBaseline(season, mode, size)[["LOC_X", "LOC_Y", "FG_PCT"]].rename(columns={"FG_PCT": "LEAGUE_FG_PCT"})
+    bins = bins.merge(league, on=["LOC_X", "LOC_Y"], how="left")
+    bins["FG_PCT_DIFF"] = (bins["FG_PCT"] - bins["LEAGUE_FG_PCT"]).fillna(0) #a bin the league never shot from counts as average
+    return bins
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build league average zone and grid tables")
+    parser.add_argument("startYear", type=int, help="first season's start year, e.g. 2015 for 2015-16")
+    parser.add_argument("endYear", type=int, help="season start year to stop before, like range()")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[BIN_SIZE], help="grid bin widths to build")
+    parser.add_argument("--force", action="store_true", help="rebuild tables that are still fresh")
+    args = parser.parse_args(argv)
+
+    tables = ["zones"] + [gridTable(mode, size) for mode in GRID_MODES for size in args.sizes]
+    for year in range(args.startYear, args.endYear):
+        season = shotcache.seasonString(year)
+        if(not args.force and all(isFresh(baselinePath(season, table), season, CURRENT_SEASON_TTL) for table in tables)):
+            print("%s: up to date" % season)
+            continue
+        print("%s: %d league shots" % (season, buildBaseline(season, tuple(args.sizes))))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#in-process timings and counters, served in prometheus text format, cheap enough to leave on
+
+import time
+import threading
+from contextlib import contextmanager
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0) #seconds
+HELP = {
+    "shotchart_stage_seconds": "Time spent in each stage of building a chart",
+    "shotchart_cache_requests_total": "Shot and figure cache lookups by result",
+    "shotchart_upstream_requests_total": "Requests sent to stats.nba.com",
+    "shotchart_upstream_errors_total": "Requests to stats.nba.com that raised, by exception type",
+}
+
+_lock = threading.Lock()
+_counters = {} #(name, labels) -> value
+_histograms = {} #stage -> [bucket counts..., count, sum]
+
+def labelText(labels):
+    if(not labels):
+        return ""
+    return "{%s}" % ",".join('%s="%s"' % (key, str(value).replace('"', '\\"')) for key, value in labels)
+
+def inc(name, amount=1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def observe(stage, seconds):
+    with _lock:
+        histogram = _histograms.get(stage)
+        if(histogram is None):
+            histogram = _histograms[stage] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if(seconds <= bound):
+                histogram[i] += 1
+                break
+        histogram[-2] += 1
+        histogram[-1] += seconds
+
+@contextmanager
+def timed(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+def renderMetrics():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {stage: list(histogram) for stage, histogram in _histograms.items()}
+
+    lines = []
+    name = "shotchart_stage_seconds"
+    lines.append("# HELP %s %s" % (name, HELP[name]))
+    lines.append("# TYPE %s histogram" % name)
+    for stage, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram):
+            cumulative += count
+            lines.append('%s_bucket{stage="%s",le="%s"} %d' % (name, stage, bound, cumulative))
+        lines.append('%s_bucket{stage="%s",le="+Inf"} %d' % (name, stage, histogram[-2]))
+        lines.append('%s_count{stage="%s"} %d' % (name, stage, histogram[-2]))
+        lines.append('%s_sum{stage="%s"} %.6f' % (name, stage, histogram[-1]))
+
+    written = set()
+    for (name, labels), value in sorted(counters.items()):
+        if(name not in written):
+            written.add(name)
+            if(name in HELP):
+                lines.append("# HELP %s %s" % (name, HELP[name]))
+            lines.append("# TYPE %s counter" % name)
+        lines.append("%s%s %s" % (name, labelText(labels), value))
+    return "\n".join(lines) + "\n"
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
@@ -0,0 +1,153 @@
+#in-memory player name index, built once from nba_api's static player list, for exact, prefix and fuzzy lookup, plus the same for teams
+
+import heapq
+import difflib
+import threading
+import collections
+import unicodedata
+from functools import lru_cache
+
+FUZZY_CUTOFF = 0.8 #lowest difflib ratio accepted as a typo of a real name
+SUGGESTION_LIMIT = 10
+FUZZY_CANDIDATES = 64 #names sharing the most trigrams with a typo, the only ones difflib scores
+
+_index = None
+_indexLock = threading.Lock()
+_teams = None
+
+def normalizeName(name):
+    name = unicodedata.normalize("NFKD", str(name))
+    name = "".join(c for c in name if not unicodedata.combining(c)) #"Nikola Jokić" -> "Nikola Jokic"
+    name = name.lower().replace("-", " ")
+    name = "".join(c for c in name if c.isalnum() or c.isspace()) #"D'Angelo" -> "dangelo", "J.J." -> "jj"
+    return " ".join(name.split())
+
+def trigrams(name): #padded so the first letters count as much as the middle ones
+    padded = "  %s " % name
+    return {padded[i:i+3] for i in range(len(padded) - 2)}
+
+class PlayerIndex:
+    def __init__(self, playerList):
+        playerList = sorted(playerList, key=lambda player: (not player['is_active'], player['full_name'])) #active players come first in every result
+        self.players = {}
+        self.exact = {}
+        self.trie = {}
+        for player in playerList:
+            self.players[player['id']] = player
+            fullName = normalizeName(player['full_name'])
+            self.exact.setdefault(fullName, []).append(player['id'])
+            tokens = fullName.split()
+            for i in range(len(tokens)): #"lebron james" is reachable from both "leb" and "jam"
+                self.insert(" ".join(tokens[i:]), player['id'])
+        self.names = list(self.exact.keys())
+        self.grams = {} #trigram -> positions in self.names, narrows a fuzzy lookup to a few dozen names
+        self.gramCounts = []
+        for i, name in enumerate(self.names):
+            grams = trigrams(name)
+            self.gramCounts.append(len(grams))
+            for gram in grams:
+                self.grams.setdefault(gram, []).append(i)
+
+    def insert(self, key, playerID):
+        node = self.trie
+        for c in key:
+            node = node.setdefault(c, {})
+            ids = node.setdefault("", []) #"" never collides with a character so it holds the ids below this node
+            if(not ids or ids[-1] != playerID):
+                ids.append(playerID)
+
+    def exactMatch(self, name):
+        ids = self.exact.get(normalizeName(name))
+        if(ids is None):
+            return None
+        return self.players[ids[0]]
+
+    def prefixMatches(self, prefix, limit=SUGGESTION_LIMIT):
+        node = self.trie
+        for c in normalizeName(prefix):
+            node = node.get(c)
+            if(node is None):
+                return []
+        matches = []
+        for playerID in node.get("", []):
+            if(playerID not in matches):
+                matches.append(playerID)
+                if(len(matches) == limit):
+                    break
+        return [self.players[playerID] for playerID in matches]
+
+    def fuzzyCandidates(self, key, limit=FUZZY_CANDIDATES): #a name within FUZZY_CUTOFF of key shares most of its trigrams
+        grams = trigrams(key)
+        shared = collections.Counter()
+        for gram in grams:
+            shared.update(self.grams.get(gram, ()))
+        least = len(grams) // 4 #a close name keeps well over a quarter of the key's trigrams, names below that are not ranked at all
+        scores = {i: count / (self.gramCounts[i] + len(grams)) for i, count in shared.items() if count > least}
+        best = heapq.nlargest(limit, scores, key=scores.get)
+        return [self.names[i] for i in best]
+
+    def fuzzyMatches(self, name, limit=SUGGESTION_LIMIT, cutoff=FUZZY_CUTOFF):
+        key = normalizeName(name)
+        names = difflib.get_close_matches(key, self.fuzzyCandidates(key), n=limit, cutoff=cutoff)
+        return [self.players[self.exact[match][0]] for match in names]
+
+def getPlayerIndex():
+    global _index
+    if(_index is None):
+        with _indexLock:
+            if(_index is None):
+                from nba_api.stats.static import players #nba_api loads with the first lookup, not on import
+                _index = PlayerIndex(players.get_players())
+    return _index
+
+@lru_cache(maxsize=4096)
+def findPlayer(name, fuzzy=True):
+    index = getPlayerIndex()
+    if(not normalizeName(name)):
+        return None
+    player = index.exactMatch(name)
+    if(player is None): #"Brook" still finds Brook Lopez like the old substring search did
+        matches = index.prefixMatches(name, limit=1)
+        player = matches[0] if matches else None
+    if(player is None and fuzzy):
+        matches = index.fuzzyMatches(name, limit=1)
+        player = matches[0] if matches else None
+    return player
+
+def getPlayerID(name):
+    player = findPlayer(str(name))
+    if(player is None): #same error the old players.find_players_by_full_name(name)[0] lookup raised
+        raise IndexError("no player found for %r" % name)
+    return player['id']
+
+def suggestPlayers(prefix, limit=SUGGESTION_LIMIT):
+    if(not prefix or not normalizeName(prefix)):
+        return []
+    index = getPlayerIndex()
+    matches = index.prefixMatches(prefix, limit)
+    if(not matches):
+        matches = index.fuzzyMatches(prefix, limit)
+    return matches
+
+def getTeamNames(): #every way a team is typed ("Milwaukee Bucks", "bucks", "milwaukee", "MIL") -> team
+    global _teams
+    if(_teams is None):
+        from nba_api.stats.static import teams
+        names = {}
+        for team in teams.get_teams():
+            for name in (team['full_name'], team['nickname'], team['city'], team['abbreviation']):
+                names.setdefault(normalizeName(name), team) #"los angeles" stays the first team listed for it
+        _teams = names
+    return _teams
+
+@lru_cache(maxsize=256)
+def findTeam(name, fuzzy=True):
+    names = getTeamNames()
+    key = normalizeName(name)
+    if(not key):
+        return None
+    team = names.get(key)
+    if(team is None and fuzzy):
+        matches = difflib.get_close_matches(key, list(names), n=1, cutoff=FUZZY_CUTOFF)
+        team = names[matches[0]] if matches else None
+    return team
@@ -0,0 +1,39 @@
+#"YYYY-YY" season names and where today falls in the season calendar, shared by the shot cache and the catalog
+
+import re
+import time
+import datetime
+
+SEASON_START_MONTH = 10 #a season starts in october and is named after the year it started in
+SEASON_END_MONTH = 7 #the finals are over by july
+
+def seasonString(year):
+    return f"{str(year)}-{str(year+1)[-2:]}"
+
+def seasonStartYear(season):
+    match = re.fullmatch(r"(\d{4})-(\d{2})", str(season).strip())
+    if(match is None):
+        return None
+    year = int(match.group(1))
+    if(int(match.group(2)) != (year+1) % 100): #"2018-20" is not a season
+        return None
+    return year
+
+def isSeasonString(season):
+    return seasonStartYear(season) is not None
+
+def currentSeasonStartYear():
+    now = datetime.datetime.now()
+    if(now.month >= SEASON_START_MONTH):
+        return now.year
+    return now.year-1
+
+def currentSeason():
+    return seasonString(currentSeasonStartYear())
+
+def isFinishedSeason(season):
+    year = seasonStartYear(season)
+    return year is not None and year < currentSeasonStartYear()
+
+def seasonEndTime(season): #first of july after the season, as a timestamp
+    return time.mktime((seasonStartYear(season) + 1, SEASON_END_MONTH, 1, 0, 0, 0, 0, 0, -1))
@@ -0,0 +1,49 @@
+#server side aggregation of shots into hex or square bins with numpy, so charts scale with bins instead of shots
+
+import numpy as np
+
+BIN_SIZE = 15 #bin width in court units (tenths of a foot)
+
+def squareBins(x, y, size):
+    ix = np.floor(x / size).astype(np.int64)
+    iy = np.floor(y / size).astype(np.int64)
+    return ix, iy, (ix + 0.5) * size, (iy + 0.5) * size
+
+def hexBins(x, y, size): #nearest center of two offset rectangular lattices, the same trick matplotlib's hexbin uses
+    width = size
+    height = size * np.sqrt(3)
+    ix1 = np.round(x / width)
+    iy1 = np.round(y / height)
+    ix2 = np.floor(x / width)
+    iy2 = np.floor(y / height)
+    d1 = (x - ix1 * width) ** 2 + (y - iy1 * height) ** 2
+    d2 = (x - (ix2 + 0.5) * width) ** 2 + (y - (iy2 + 0.5) * height) ** 2
+    first = d1 <= d2
+    ix = np.where(first, 2 * ix1, 2 * ix2 + 1).astype(np.int64) #even columns are the first lattice, odd the offset one
+    iy = np.where(first, 2 * iy1, 2 * iy2 + 1).astype(np.int64)
+    return ix, iy, ix * width / 2, iy * height / 2
+
+def binShots(shotData, mode="hex", size=BIN_SIZE): #mode is "hex" or "square"
+    import pandas as pd
+    x = shotData["LOC_X"].to_numpy(dtype=np.float64)
+    y = shotData["LOC_Y"].to_numpy(dtype=np.float64)
+    made = shotData["SHOT_MADE_FLAG"].to_numpy(dtype=np.int64)
+    if(mode == "square"):
+        ix, iy, cx, cy = squareBins(x, y, size)
+    else:
+        ix, iy, cx, cy = hexBins(x, y, size)
+
+    if(len(ix)):
+        keys = (ix - ix.min()) * (iy.max() - iy.min() + 1) + (iy - iy.min()) #one int per bin, much faster to unique than (ix, iy) rows
+    else:
+        keys = ix
+    uniqueKeys, firstIndex, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    attempts = np.bincount(inverse, minlength=len(uniqueKeys))
+    makes = np.bincount(inverse, weights=made, minlength=len(uniqueKeys)).astype(np.int64)
+    return pd.DataFrame({
+        "LOC_X": cx[firstIndex].round(1),
+        "LOC_Y": cy[firstIndex].round(1),
+        "ATTEMPTS": attempts,
+        "MAKES": makes,
+        "FG_PCT": makes / np.maximum(attempts, 1),
+    })
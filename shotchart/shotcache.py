@@ -0,0 +1,157 @@
+#on-disk cache in front of ShotChartDetail, keyed by (player_id, season, context_measure, team_id)
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .transport import getTransport
+from .statshttp import requestWithRetries
+from .singleflight import SingleFlight, fileLock
+from . import metrics
+from .shotstore import compactShots
+from .seasons import isSeasonString, isFinishedSeason, seasonEndTime
+from .seasons import seasonString, currentSeason # noqa: F401 re-exported, callers use shotcache.seasonString
+
+CACHE_DIR = os.environ.get("SHOTCHART_CACHE_DIR", os.path.abspath(".shotcache")) #in the directory the app or cli runs from, never inside an installed package
+CURRENT_SEASON_TTL = float(os.environ.get("SHOTCHART_CACHE_TTL", 6*60*60)) #seconds before the in-progress season is fetched again
+MAX_WORKERS = int(os.environ.get("SHOTCHART_MAX_WORKERS", 4)) #most seasons fetched at the same time
+BASELINE_SUBDIR = "baselines" #leaguebaseline's tables, kept next to the season directories
+REQUEST_INTERVAL = float(os.environ.get("SHOTCHART_REQUEST_INTERVAL", 0.25)) #least seconds between two requests to stats.nba.com
+
+class RateLimiter:
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.nextTime = 0.0
+
+    def wait(self): #hands out evenly spaced start times so parallel fetches stay polite
+        with self.lock:
+            now = time.monotonic()
+            waitTime = self.nextTime - now
+            self.nextTime = max(now, self.nextTime) + self.interval
+        if(waitTime > 0):
+            time.sleep(waitTime)
+
+rateLimiter = RateLimiter(REQUEST_INTERVAL)
+shotFlights = SingleFlight()
+
+def cachePath(playerID, season, contextMeasure="FGA", teamID=0):
+    if(teamID): #player 0 with a team is that team's whole shot set
+        return os.path.join(CACHE_DIR, "season=%s" % season, "%s_%s_%s.parquet" % (playerID, contextMeasure, teamID))
+    return os.path.join(CACHE_DIR, "season=%s" % season, "%s_%s.parquet" % (playerID, contextMeasure))
+
+def fetchShotData(playerID, season, contextMeasure="FGA", dateFrom="", teamID=0): #dateFrom is "MM/DD/YYYY", only shots from that day on are returned
+    params = dict(team_id = teamID, player_id = playerID, season_nullable= str(season), context_measure_simple= contextMeasure, date_from_nullable= dateFrom)
+    def attempt():
+        rateLimiter.wait()
+        metrics.inc("shotchart_upstream_requests_total")
+        try:
+            with metrics.timed("upstream"):
+                return getTransport().request(params)
+        except Exception as e:
+            metrics.inc("shotchart_upstream_errors_total", error=type(e).__name__)
+            raise
+    response = requestWithRetries(attempt) #transient failures are retried, ones that outlast the retries raise statshttp.UpstreamError
+    with metrics.timed("parse"):
+        return responseFrame(response)
+
+def responseFrame(response): #the Shot_Chart_Detail result set, what ShotChartDetail(...).get_data_frames()[0] returns
+    import pandas as pd
+    resultSets = response["resultSets"]
+    resultSet = next((r for r in resultSets if r["name"] == "Shot_Chart_Detail"), resultSets[0])
+    return pd.DataFrame(resultSet["rowSet"], columns=resultSet["headers"])
+
+def readShotData(path):
+    import pandas as pd #pandas and pyarrow load on the first read, not when a worker or cli imports this module
+    return compactShots(pd.read_parquet(path))
+
+def writeShotData(path, shotData):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmpPath = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+    shotData.to_parquet(tmpPath, index=False)
+    os.replace(tmpPath, path) #readers never see a half written file
+
+def isFresh(path, season, ttl):
+    if(not os.path.exists(path)):
+        return False
+    mtime = os.path.getmtime(path)
+    if(isFinishedSeason(season) and mtime >= seasonEndTime(season)): #written after the season ended, it holds every game and never changes
+        return True
+    return time.time() - mtime < ttl #a file written mid-season is refreshed like the current season, even once that season is over
+
+def isCached(playerID, season, contextMeasure="FGA", ttl=None, teamID=0):
+    if(not isSeasonString(season)):
+        return False
+    if(ttl is None):
+        ttl = CURRENT_SEASON_TTL
+    return isFresh(cachePath(playerID, season, contextMeasure, teamID), season, ttl)
+
+def getShotData(playerID, season, contextMeasure="FGA", ttl=None, teamID=0):
+    if(not isSeasonString(season)): #never build a cache path out of unchecked input
+        return compactShots(fetchShotData(playerID, season, contextMeasure, teamID=teamID))
+    if(ttl is None):
+        ttl = CURRENT_SEASON_TTL
+
+    path = cachePath(playerID, season, contextMeasure, teamID)
+    if(isFresh(path, season, ttl)):
+        metrics.inc("shotchart_cache_requests_total", cache="shots", result="hit")
+        return readShotData(path)
+
+    shotData, shared = shotFlights.do((playerID, season, contextMeasure, teamID), lambda: loadShotData(playerID, season, contextMeasure, ttl, teamID)) #threads asking for a key that is already downloading wait for that download
+    if(shared): #callers flip LOC_X in place, so nobody gets the frame another caller holds
+        return shotData.copy()
+    return shotData
+
+def loadShotData(playerID, season, contextMeasure, ttl, teamID=0):
+    path = cachePath(playerID, season, contextMeasure, teamID)
+    with fileLock(path + ".lock"): #other worker processes on this host wait here and then find the file this one wrote
+        if(isFresh(path, season, ttl)):
+            metrics.inc("shotchart_cache_requests_total", cache="shots", result="coalesced")
+            return readShotData(path)
+        if(os.path.exists(path)): #a stale in-progress season only needs the games played since it was stored
+            metrics.inc("shotchart_cache_requests_total", cache="shots", result="refresh")
+            return refreshShotData(playerID, season, contextMeasure, teamID)
+        metrics.inc("shotchart_cache_requests_total", cache="shots", result="miss")
+
+        shotData = compactShots(fetchShotData(playerID, season, contextMeasure, teamID=teamID)) #only the narrow columns are stored
+        writeShotData(path, shotData)
+        return shotData
+
+def refreshShotData(playerID, season, contextMeasure="FGA", teamID=0):
+    import pandas as pd
+    path = cachePath(playerID, season, contextMeasure, teamID)
+    stored = readShotData(path) if os.path.exists(path) else None
+    if(stored is None or len(stored) == 0 or "GAME_DATE" not in stored.columns): #nothing to build on, download the whole season
+        shotData = compactShots(fetchShotData(playerID, season, contextMeasure, teamID=teamID))
+        writeShotData(path, shotData)
+        return shotData
+
+    lastDate = int(stored["GAME_DATE"].max()) #YYYYMMDD of the newest stored game
+    dateFrom = "%02d/%02d/%04d" % (lastDate // 100 % 100, lastDate % 100, lastDate // 10000)
+    newShots = compactShots(fetchShotData(playerID, season, contextMeasure, dateFrom=dateFrom, teamID=teamID)) #the last stored day is fetched again in case it was stored mid-game
+    if(len(newShots) == 0):
+        os.utime(path) #nothing new, restart the ttl
+        return stored
+
+    shotData = compactShots(pd.concat([stored.loc[stored["GAME_DATE"] < lastDate], newShots], ignore_index=True)) #concat turns mismatched categories into strings, compactShots makes them categories again
+    writeShotData(path, shotData)
+    return shotData
+
+def getSeasonsData(playerID, seasons, contextMeasure="FGA", maxWorkers=None):
+    if(maxWorkers is None):
+        maxWorkers = MAX_WORKERS
+    seasons = list(seasons)
+    if(maxWorkers <= 1 or len(seasons) <= 1):
+        return [getShotData(playerID, season, contextMeasure) for season in seasons]
+    with ThreadPoolExecutor(max_workers=min(maxWorkers, len(seasons))) as executor:
+        return list(executor.map(lambda season: getShotData(playerID, season, contextMeasure), seasons)) #map keeps the frames in season order
+
+def clearCache(season=None): #shot files and the league baselines built from them, for one season or all of them
+    import shutil
+    for root in (CACHE_DIR, os.path.join(CACHE_DIR, BASELINE_SUBDIR)):
+        if(season is None):
+            seasonDirs = [name for name in os.listdir(root) if name.startswith("season=")] if os.path.isdir(root) else []
+        else:
+            seasonDirs = ["season=%s" % season]
+        for seasonDir in seasonDirs:
+            shutil.rmtree(os.path.join(root, seasonDir), ignore_errors=True)
@@ -0,0 +1,163 @@
+#trace building shared by the charts, switches from svg to webgl markers for large shot sets
+
+import os
+import pandas # noqa: F401 plotly looks pandas up in sys.modules, so it must never see one another thread is still importing
+import plotly.graph_objs as go
+from plotly.subplots import make_subplots
+from .shotbins import binShots
+from .courtshapes import getCourtShapes
+from .shotraster import COURT_RANGE
+
+WEBGL_THRESHOLD = int(os.environ.get("SHOTCHART_WEBGL_THRESHOLD", 5000)) #markers in a figure above which webgl is used
+
+def courtAxes(xRange=COURT_RANGE[0], yRange=COURT_RANGE[1]): #bare x and y axes over the court window, for a layout or update_xaxes/update_yaxes
+    axis = dict(showgrid=False, showticklabels=False, zeroline=False)
+    return dict(xaxis=dict(axis, range=list(xRange)), yaxis=dict(axis, range=list(yRange)))
+
+def scatterClass(points, renderer="auto"): #renderer is "auto", "svg" or "webgl"
+    if(renderer == "webgl"):
+        return go.Scattergl
+    if(renderer == "svg"):
+        return go.Scatter
+    if(points > WEBGL_THRESHOLD):
+        return go.Scattergl
+    return go.Scatter
+
+def shotTraces(shotData, renderer="auto", points=None, madeColor="BLUE", missedColor="RED", showlegend=None, opacity=None): #points is the marker count of the whole figure when it has several subplots
+    if(points is None):
+        points = len(shotData)
+    Scatter = scatterClass(points, renderer)
+    made_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 1]
+    missed_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 0]
+    return [
+        Scatter(x=made_shots["LOC_X"], y=made_shots["LOC_Y"], mode='markers', marker_color=madeColor, name="Made Shot", showlegend=showlegend, opacity=opacity),
+        Scatter(x=missed_shots["LOC_X"], y=missed_shots["LOC_Y"], mode='markers', marker_color=missedColor, name="Missed Shot", showlegend=showlegend, opacity=opacity)
+    ]
+
+def binnedTrace(bins, mode="hex", maxMarkerSize=18, showscale=True, column="FG_PCT", colorscale='RdYlBu', colorRange=(0, 1), title="FG%", tickformat='.0%'): #one trace for the whole chart, sized by attempts and colored by column
+    attempts = bins["ATTEMPTS"]
+    sizes = (maxMarkerSize * (attempts / max(attempts.max(), 1)) ** 0.5).round(1) if len(bins) else []
+    return go.Scatter(
+        x=bins["LOC_X"],
+        y=bins["LOC_Y"],
+        mode='markers',
+        name=title,
+        showlegend=False,
+        marker=dict(
+            symbol='hexagon' if mode == "hex" else 'square',
+            size=sizes,
+            sizemin=2,
+            color=bins[column].round(3),
+            colorscale=colorscale,
+            reversescale=True,
+            cmin=colorRange[0],
+            cmax=colorRange[1],
+            showscale=showscale,
+            colorbar=dict(title=title, tickformat=tickformat)
+        )
+    )
+
+def relativeTrace(bins, mode="hex", maxMarkerSize=18, showscale=True, spread=0.15): #bins from leaguebaseline.relativeBins, colored by FG% above or below the league
+    return binnedTrace(bins, mode, maxMarkerSize, showscale, "FG_PCT_DIFF", 'RdBu', (-spread, spread), "FG% vs league", '+.0%')
+
+def chartTraces(shotData, chartMode="shots", renderer="auto", points=None, showlegend=None, **kwargs): #chartMode is "shots", "hex" or "square"
+    if(chartMode == "shots"):
+        return shotTraces(shotData, renderer, points, showlegend=showlegend, **kwargs)
+    return [binnedTrace(binShots(shotData, chartMode), chartMode, showscale=showlegend is not False)] #only the subplot with the legend gets a colorbar
+
+def seasonGridFigure(title, seasons, framesBySeason, chartMode="shots", renderer="auto"): #two column grid, one subplot per season, seasons missing from framesBySeason are drawn as still loading
+    rows = max((len(seasons)+1) // 2, 1)
+    titles = []
+    for season in seasons:
+        if(season not in framesBySeason):
+            titles.append("%s (loading)" % season)
+        elif(framesBySeason[season] is None):
+            titles.append("%s (failed)" % season)
+        else:
+            titles.append(season)
+    fig = make_subplots(rows=rows, cols=2, subplot_titles=titles)
+
+    points = sum(len(shotData) for shotData in framesBySeason.values() if shotData is not None)
+    for i, season in enumerate(seasons):
+        shotData = framesBySeason.get(season)
+        if(shotData is None):
+            continue
+        shotData = shotData.assign(LOC_X=-shotData["LOC_X"]) #flipped copy, the frame may be shared with other requests
+        for trace in chartTraces(shotData, chartMode, renderer, points, missedColor="Red", showlegend=False, opacity=0.5):
+            fig.append_trace(trace, i // 2 + 1, i % 2 + 1)
+
+    axes = courtAxes()
+    fig.update_xaxes(axes["xaxis"])
+    fig.update_yaxes(axes["yaxis"])
+    fig.update_layout(
+        title=title,
+        showlegend=False,
+        height=450*rows,
+        shapes=getCourtShapes(len(seasons)),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        hovermode=False
+    )
+    return fig
+
+def seasonSliderFigure(title, seasons, framesBySeason, chartMode="shots", renderer="auto", flipped=False, height=900, width=1000): #one court and one layout, the slider swaps in each season's precomputed frame
+    seasons = [season for season in seasons if framesBySeason.get(season) is not None]
+    points = max([len(framesBySeason[season]) for season in seasons] + [0]) #one season is drawn at a time, and every frame needs the same trace type
+    frames = []
+    for season in seasons:
+        shotData = framesBySeason[season]
+        if(not flipped):
+            shotData = shotData.assign(LOC_X=-shotData["LOC_X"])
+        frames.append(go.Frame(name=season, data=chartTraces(shotData, chartMode, renderer, points)))
+
+    redraw = scatterClass(points, renderer) is go.Scattergl or chartMode != "shots" #webgl traces and colorbars only update on a redraw, plain svg markers can skip it
+    steps = [dict(
+        label=season,
+        method="animate",
+        args=[[season], dict(mode="immediate", frame=dict(duration=0, redraw=redraw), transition=dict(duration=0))]
+    ) for season in seasons]
+
+    fig = go.Figure(data=frames[0].data if frames else [], frames=frames)
+    layout = go.Layout(
+        title=title,
+        showlegend=chartMode == "shots",
+        **courtAxes(),
+        height = height,
+        width = width,
+        shapes=getCourtShapes(),
+        hovermode=False,
+        sliders=[dict(active=0, currentvalue=dict(prefix="Season: "), pad=dict(t=30), steps=steps)]
+    )
+    fig.update(layout=layout)
+    return fig
+
+def shotChartFigure(shotData, title, chartMode="shots", renderer="auto", height=800, width=1000): #one season on one court, shotData straight from the shot cache
+    shotData = shotData.assign(LOC_X=-shotData["LOC_X"])
+    fig = go.Figure(data=chartTraces(shotData, chartMode, renderer))
+    layout = go.Layout(
+        title=title,
+        showlegend=True,
+        **courtAxes(),
+        height = height,
+        width = width,
+        shapes=getCourtShapes(),
+        hovermode=False
+    )
+    fig.update(layout=layout)
+    return fig
+
+def courtFigure(title, xRange=COURT_RANGE[0], yRange=COURT_RANGE[1], images=()): #an empty court in the layout every full size graph of the dash app shares, zoomed to a window
+    fig = go.Figure()
+    layout = go.Layout(
+        title=title,
+        showlegend=False,
+        **courtAxes(xRange, yRange),
+        height=800,
+        shapes=getCourtShapes(),
+        images=list(images),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        hovermode=False
+    )
+    fig.update(layout=layout)
+    return fig
@@ -0,0 +1,91 @@
+#server side rasterization of team and league sized shot sets into a png laid under the court, one image instead of a marker per shot
+
+import os
+import zlib
+import base64
+import struct
+import numpy as np
+
+RASTER_WIDTH = int(os.environ.get("SHOTCHART_RASTER_WIDTH", 600)) #pixels across the visible window, rows follow the window's aspect ratio
+CHUNK = 1 << 20 #shots binned per pass, keeps the temporaries the same size however many shots there are
+COURT_RANGE = ((-300, 300), (-100, 500)) #the x and y ranges every chart opens with
+
+#density color ramp from transparent to dark red, stops are (position, r, g, b, a)
+RAMP = np.array([
+    (0.0, 255, 255, 204, 0),
+    (0.15, 255, 237, 160, 160),
+    (0.4, 254, 178, 76, 200),
+    (0.7, 240, 59, 32, 230),
+    (1.0, 128, 0, 38, 255),
+], dtype=np.float64)
+LUT = np.stack([np.interp(np.linspace(0, 1, 256), RAMP[:, 0], RAMP[:, i]) for i in range(1, 5)], axis=1).round().astype(np.uint8)
+
+def rasterSize(xRange, yRange, width=None):
+    if(width is None):
+        width = RASTER_WIDTH
+    width = max(min(width, int(np.ceil(xRange[1] - xRange[0]))), 1) #shot locations are whole court units, finer pixels would only show the grid between them
+    height = max(int(round(width * (yRange[1] - yRange[0]) / max(xRange[1] - xRange[0], 1e-9))), 1)
+    return width, min(height, 4 * width) #a very thin window must not ask for an enormous image
+
+def densityCounts(x, y, xRange, yRange, width, height): #shots per pixel, row 0 is the bottom of the window
+    counts = np.zeros(width * height, dtype=np.int64)
+    xScale = width / (xRange[1] - xRange[0])
+    yScale = height / (yRange[1] - yRange[0])
+    for start in range(0, len(x), CHUNK):
+        px = np.floor((np.asarray(x[start:start+CHUNK], dtype=np.float32) - xRange[0]) * xScale).astype(np.int64)
+        py = np.floor((np.asarray(y[start:start+CHUNK], dtype=np.float32) - yRange[0]) * yScale).astype(np.int64)
+        inside = (px >= 0) & (px < width) & (py >= 0) & (py < height) #only the visible window is binned
+        counts += np.bincount(py[inside] * width + px[inside], minlength=width * height)
+    return counts.reshape(height, width)
+
+def colorize(counts): #log scaled so the rim does not wash out every other spot
+    rgba = np.zeros(counts.shape + (4,), dtype=np.uint8)
+    if(counts.max() > 0):
+        levels = np.log1p(counts) / np.log1p(counts.max())
+        rgba = LUT[np.round(levels * 255).astype(np.uint8)]
+        rgba[counts == 0] = 0
+    return rgba[::-1] #png rows go top to bottom
+
+def encodePNG(rgba): #8 bit rgba png with only zlib and struct, no imaging library needed
+    height, width, _ = rgba.shape
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8) #every row starts with filter type 0
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + chunk(b"IEND", b"")
+
+def densityImage(x, y, xRange=COURT_RANGE[0], yRange=COURT_RANGE[1], width=None): #layout image covering exactly the window, x and y as drawn (LOC_X flipped)
+    width, height = rasterSize(xRange, yRange, width)
+    png = encodePNG(colorize(densityCounts(x, y, xRange, yRange, width, height)))
+    return dict(
+        source="data:image/png;base64," + base64.b64encode(png).decode("ascii"),
+        xref="x",
+        yref="y",
+        x=xRange[0],
+        y=yRange[1],
+        sizex=xRange[1] - xRange[0],
+        sizey=yRange[1] - yRange[0],
+        sizing="stretch",
+        xanchor="left",
+        yanchor="top",
+        layer="below"
+    )
+
+def visibleRange(relayoutData, current=COURT_RANGE): #the window after a pan or zoom, or the whole court after a reset
+    if(not relayoutData):
+        return current
+    if(relayoutData.get("xaxis.autorange") or relayoutData.get("autosize")):
+        return COURT_RANGE
+    xRange = list(current[0])
+    yRange = list(current[1])
+    for axis, window in (("xaxis", xRange), ("yaxis", yRange)):
+        if("%s.range" % axis in relayoutData):
+            window[:] = relayoutData["%s.range" % axis]
+        for i in (0, 1):
+            key = "%s.range[%d]" % (axis, i)
+            if(key in relayoutData):
+                window[i] = relayoutData[key]
+    return (tuple(float(v) for v in xRange), tuple(float(v) for v in yRange))
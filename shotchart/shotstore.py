@@ -0,0 +1,113 @@
+#compact columnar shot representation and a league sized store of player-seasons backed by memory-mapped numpy columns
+
+import os
+import json
+
+#the only ShotChartDetail columns kept around, with the narrowest dtype that holds them
+SHOT_COLUMNS = {
+    "GAME_ID": "int32", #"0021800001" -> 21800001
+    "GAME_EVENT_ID": "int16",
+    "PLAYER_ID": "int32",
+    "TEAM_ID": "int32",
+    "PERIOD": "int8",
+    "MINUTES_REMAINING": "int8",
+    "SECONDS_REMAINING": "int8",
+    "ACTION_TYPE": "category",
+    "SHOT_TYPE": "category",
+    "SHOT_ZONE_BASIC": "category",
+    "SHOT_ZONE_AREA": "category",
+    "SHOT_ZONE_RANGE": "category",
+    "SHOT_DISTANCE": "int16",
+    "LOC_X": "int16",
+    "LOC_Y": "int16",
+    "SHOT_MADE_FLAG": "bool",
+    "GAME_DATE": "int32", #"20181016" -> 20181016
+}
+
+def compactShots(shotData):
+    columns = [column for column in SHOT_COLUMNS if column in shotData.columns]
+    return shotData[columns].astype({column: SHOT_COLUMNS[column] for column in columns})
+
+class ShotStore:
+    def __init__(self, columns, categories, offsets):
+        self.columns = columns #column name -> numpy array (category columns hold codes)
+        self.categories = categories #column name -> list of category values
+        self.offsets = offsets #(player_id, season) -> (start, stop) row range
+
+    @classmethod
+    def fromFrames(cls, frames): #frames maps (player_id, season) -> shot frame
+        import pandas as pd
+        offsets = {}
+        parts = []
+        start = 0
+        for key, shotData in frames.items():
+            shotData = compactShots(shotData)
+            offsets[key] = (start, start + len(shotData))
+            start += len(shotData)
+            parts.append(shotData)
+        if(parts):
+            combined = pd.concat(parts, ignore_index=True)
+        else:
+            combined = pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in SHOT_COLUMNS.items()})
+
+        columns = {}
+        categories = {}
+        for column in combined.columns:
+            if(SHOT_COLUMNS[column] == "category"): #concat falls back to object when categories differ, so recode over the whole league
+                values = combined[column].astype("category")
+                categories[column] = [str(value) for value in values.cat.categories]
+                columns[column] = values.cat.codes.to_numpy().astype("int16")
+            else:
+                columns[column] = combined[column].to_numpy().astype(SHOT_COLUMNS[column])
+        return cls(columns, categories, offsets)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, key):
+        return key in self.offsets
+
+    def keys(self):
+        return self.offsets.keys()
+
+    def nbytes(self):
+        return sum(values.nbytes for values in self.columns.values())
+
+    def get(self, playerID, season):
+        start, stop = self.offsets[(playerID, season)]
+        return self.frame(start, stop)
+
+    def frame(self, start=0, stop=None):
+        import pandas as pd
+        data = {}
+        for column, values in self.columns.items():
+            if(column in self.categories):
+                data[column] = pd.Categorical.from_codes(values[start:stop], self.categories[column])
+            else:
+                data[column] = values[start:stop]
+        return pd.DataFrame(data)
+
+    def save(self, directory):
+        import numpy as np
+        os.makedirs(directory, exist_ok=True)
+        for column, values in self.columns.items():
+            np.save(os.path.join(directory, column + ".npy"), values)
+        meta = {
+            "categories": self.categories,
+            "offsets": [[playerID, season, start, stop] for (playerID, season), (start, stop) in self.offsets.items()],
+        }
+        with open(os.path.join(directory, "store.json"), "w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True): #mmap leaves the columns on disk and lets the os page in only what is read
+        import numpy as np
+        with open(os.path.join(directory, "store.json")) as f:
+            meta = json.load(f)
+        columns = {}
+        for column in SHOT_COLUMNS:
+            path = os.path.join(directory, column + ".npy")
+            if(os.path.exists(path)):
+                columns[column] = np.load(path, mmap_mode="r" if mmap else None)
+        offsets = {(playerID, season): (start, stop) for playerID, season, start, stop in meta["offsets"]}
+        return cls(columns, meta["categories"], offsets)
@@ -0,0 +1,69 @@
+#vectorized shot zone classifier over the court geometry in courtshapes, and per zone attempts, FG% and points per shot
+
+import os
+from functools import lru_cache
+import numpy as np
+from .shotcache import getShotData, isCached, isSeasonString, cachePath
+
+#court units are tenths of a foot from the center of the hoop, the same numbers courtshapes draws
+RESTRICTED_RADIUS = 40 #res_area_shape
+PAINT_HALF_WIDTH = 80 #outer_three_sec_shape
+PAINT_TOP = 143.5
+CORNER_X = 220 #left_line_shape / right_line_shape
+CORNER_TOP = 92.5 #where the corner lines meet the arc
+THREE_RADIUS = 237.5
+HALF_COURT = 422.5 #outer_lines_shape
+
+#the names stats.nba.com uses in SHOT_ZONE_BASIC, so the two can be compared
+ZONES = ("Restricted Area", "In The Paint (Non-RA)", "Mid-Range", "Left Corner 3", "Right Corner 3", "Above the Break 3", "Backcourt")
+THREE_POINT_ZONES = ("Left Corner 3", "Right Corner 3", "Above the Break 3", "Backcourt")
+ZONE_POINTS = np.array([3 if zone in THREE_POINT_ZONES else 2 for zone in ZONES], dtype=np.int64)
+
+def zoneCodes(x, y): #index into ZONES for every shot, x and y are raw LOC_X/LOC_Y (not flipped for drawing)
+    x = np.asarray(x, dtype=np.float32)
+    y = np.asarray(y, dtype=np.float32)
+    distance = np.hypot(x, y)
+    corner = (np.abs(x) > CORNER_X) & (y <= CORNER_TOP)
+    conditions = [ #np.select takes the first that holds, so the order is the order of the checks
+        y > HALF_COURT,
+        distance <= RESTRICTED_RADIUS,
+        (np.abs(x) <= PAINT_HALF_WIDTH) & (y <= PAINT_TOP),
+        corner & (x < 0),
+        corner & (x > 0),
+        distance > THREE_RADIUS,
+    ]
+    choices = [ZONES.index(zone) for zone in ("Backcourt", "Restricted Area", "In The Paint (Non-RA)", "Left Corner 3", "Right Corner 3", "Above the Break 3")]
+    return np.select(conditions, choices, default=ZONES.index("Mid-Range")).astype(np.int8)
+
+def classifyShots(shotData): #the zone of every shot as a categorical aligned with shotData
+    import pandas as pd
+    codes = zoneCodes(shotData["LOC_X"].to_numpy(), shotData["LOC_Y"].to_numpy())
+    return pd.Series(pd.Categorical.from_codes(codes, ZONES), index=shotData.index, name="ZONE")
+
+def zoneEfficiency(shotData): #one row per zone, empty zones included so tables always line up
+    import pandas as pd
+    codes = zoneCodes(shotData["LOC_X"].to_numpy(), shotData["LOC_Y"].to_numpy())
+    made = shotData["SHOT_MADE_FLAG"].to_numpy(dtype=np.int64)
+    attempts = np.bincount(codes, minlength=len(ZONES))
+    makes = np.bincount(codes, weights=made, minlength=len(ZONES)).astype(np.int64)
+    points = makes * ZONE_POINTS
+    total = max(int(attempts.sum()), 1)
+    return pd.DataFrame({
+        "ATTEMPTS": attempts,
+        "MAKES": makes,
+        "FG_PCT": makes / np.maximum(attempts, 1),
+        "PTS_PER_SHOT": points / np.maximum(attempts, 1),
+        "FREQUENCY": attempts / total,
+    }, index=pd.Index(ZONES, name="ZONE"))
+
+@lru_cache(maxsize=1024)
+def cachedZoneEfficiency(playerID, season, contextMeasure, version): #version is the shot file's mtime, a refreshed season gets a new entry
+    return zoneEfficiency(getShotData(playerID, season, contextMeasure))
+
+def getZoneEfficiency(playerID, season, contextMeasure="FGA"):
+    if(not isSeasonString(season)):
+        return zoneEfficiency(getShotData(playerID, season, contextMeasure))
+    if(not isCached(playerID, season, contextMeasure)):
+        getShotData(playerID, season, contextMeasure) #downloads or refreshes the season so the file below is current
+    version = os.path.getmtime(cachePath(playerID, season, contextMeasure))
+    return cachedZoneEfficiency(playerID, season, contextMeasure, version).copy() #callers get their own table, the cached one is shared
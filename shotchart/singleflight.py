@@ -0,0 +1,60 @@
+#collapses concurrent identical requests into one: threads in a process share one call, processes on a host take turns through a lock file
+
+import os
+import threading
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError: #no flock on windows, there only threads are coalesced
+    fcntl = None
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.dups = 0
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, function): #returns (result, shared), shared is True when other callers got the same object
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if(leader):
+                call = self.calls[key] = _Call()
+            else:
+                call.dups += 1
+        if(not leader): #someone is already fetching this key, wait for their answer
+            call.event.wait()
+            if(call.error is not None):
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+                shared = call.dups > 0
+            call.event.set()
+        return call.result, shared
+
+@contextmanager
+def fileLock(path): #held until the block ends, other processes asking for the same path wait for it
+    if(fcntl is None):
+        yield
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
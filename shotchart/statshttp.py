@@ -0,0 +1,125 @@
+#shared keep-alive session, bounded retries with jittered exponential backoff and a circuit breaker for stats.nba.com
+
+import os
+import time
+import random
+import threading
+from . import metrics
+
+POOL_SIZE = int(os.environ.get("SHOTCHART_POOL_SIZE", 10)) #kept-alive connections, at least the number of fetch threads
+TIMEOUT = float(os.environ.get("SHOTCHART_TIMEOUT", 10)) #seconds per request attempt
+MAX_RETRIES = int(os.environ.get("SHOTCHART_MAX_RETRIES", 3))
+BACKOFF_BASE = float(os.environ.get("SHOTCHART_BACKOFF_BASE", 0.5)) #seconds before the first retry, doubled for every retry after it
+BACKOFF_MAX = float(os.environ.get("SHOTCHART_BACKOFF_MAX", 8))
+BREAKER_THRESHOLD = int(os.environ.get("SHOTCHART_BREAKER_THRESHOLD", 5)) #failed attempts in a row that open the circuit
+BREAKER_COOLDOWN = float(os.environ.get("SHOTCHART_BREAKER_COOLDOWN", 30)) #seconds the circuit stays open before one trial request
+
+class UpstreamError(IOError): #stats.nba.com could not be reached, as opposed to bad input
+    retryable = True #subclasses that another attempt cannot fix set this to False
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+class UpstreamStatusError(UpstreamError):
+    def __init__(self, status, url=None):
+        UpstreamError.__init__(self, "stats.nba.com answered %s for %s" % (status, url))
+        self.status = status
+
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.openedAt = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if(self.openedAt is None):
+                return True
+            if(not self.probing and time.monotonic() - self.openedAt >= self.cooldown): #half open, let a single request find out if upstream is back
+                self.probing = True
+                return True
+            return False
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.openedAt = None
+            self.probing = False
+
+    def release(self): #the trial request ended without saying anything about upstream, the next one may try again
+        with self.lock:
+            self.probing = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if(self.probing or self.failures >= self.threshold):
+                if(self.openedAt is None or self.probing):
+                    metrics.inc("shotchart_circuit_opened_total")
+                self.openedAt = time.monotonic()
+                self.probing = False
+
+    def isOpen(self):
+        with self.lock:
+            return self.openedAt is not None
+
+breaker = CircuitBreaker()
+
+def isRetryable(e):
+    if(isinstance(e, UpstreamStatusError)): #throttling and server errors pass, other 4xx answers will not change
+        return e.status == 429 or e.status >= 500
+    if(not getattr(e, "retryable", True)):
+        return False
+    return isinstance(e, (IOError, ValueError)) #requests' timeouts and connection errors are IOErrors, throttled html answers fail json parsing with ValueError
+
+def backoff(attempt):
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+    return random.uniform(delay / 2, delay) #jitter keeps threads and workers that failed together from retrying together
+
+def requestWithRetries(send, retries=None):
+    if(retries is None):
+        retries = MAX_RETRIES
+    for attempt in range(retries + 1):
+        if(not breaker.allow()):
+            raise CircuitOpenError("stats.nba.com is failing, not retrying for %ss" % breaker.cooldown)
+        try:
+            result = send()
+        except Exception as e:
+            if(not isRetryable(e)):
+                if(isinstance(e, UpstreamStatusError)): #upstream answered, even if it refused this request
+                    breaker.success()
+                else:
+                    breaker.release() #a half open breaker must not stay waiting for this probe
+                raise
+            breaker.failure()
+            if(attempt == retries):
+                raise UpstreamError("stats.nba.com failed %d times: %s" % (attempt + 1, e)) from e
+            metrics.inc("shotchart_upstream_retries_total")
+            time.sleep(backoff(attempt))
+        else:
+            breaker.success()
+            return result
+
+_sessionLock = threading.Lock()
+_session = None
+
+def installSession(): #one pooled keep-alive session under every nba_api stats request in this process
+    global _session
+    if(_session is not None):
+        return _session
+    with _sessionLock:
+        if(_session is None):
+            import requests
+            from requests.adapters import HTTPAdapter
+            from nba_api.stats.library.http import NBAStatsHTTP
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=0) #retries are done by requestWithRetries
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if(hasattr(NBAStatsHTTP, "set_session")): #older nba_api versions open a connection per request
+                NBAStatsHTTP.set_session(session)
+            _session = session
+    return _session
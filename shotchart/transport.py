@@ -0,0 +1,100 @@
+#pluggable transport under every shot data request: live, recording to disk, or replaying from disk with injected latency and errors
+#SHOTCHART_TRANSPORT=record:recordings python dashapp.py                                         records what the app fetches
+#SHOTCHART_TRANSPORT=replay:recordings SHOTCHART_LATENCY=2 SHOTCHART_ERROR_RATE=0.1 python dashapp.py    serves it back slowly and unreliably
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from . import statshttp
+
+class TransportError(IOError):
+    pass
+
+class MissingRecordingError(LookupError, statshttp.UpstreamError): #never retried, but the app shows it like any upstream failure
+    retryable = False
+
+def requestKey(params):
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+class LiveTransport:
+    def __init__(self):
+        statshttp.installSession()
+
+    def request(self, params): #params are ShotChartDetail keyword arguments, returns the raw response dict
+        from nba_api.stats.endpoints.shotchartdetail import ShotChartDetail
+        from nba_api.stats.library.http import NBAStatsHTTP
+        endpoint = ShotChartDetail(**params, timeout=statshttp.TIMEOUT, get_request=False)
+        response = NBAStatsHTTP().send_api_request(endpoint=endpoint.endpoint, parameters=endpoint.parameters, proxy=endpoint.proxy, headers=endpoint.headers, timeout=endpoint.timeout)
+        if(response._status_code is not None and response._status_code >= 400): #nba_api hands back error pages as if they were data
+            raise statshttp.UpstreamStatusError(response._status_code, response.get_url())
+        return response.get_dict()
+
+class RecordingTransport:
+    def __init__(self, directory, inner=None):
+        self.directory = directory
+        self.inner = inner if inner is not None else LiveTransport()
+
+    def request(self, params):
+        response = self.inner.request(params)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, requestKey(params) + ".json")
+        tmpPath = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+        with open(tmpPath, "w") as f:
+            json.dump({"params": params, "response": response}, f)
+        os.replace(tmpPath, path)
+        return response
+
+class ReplayTransport:
+    def __init__(self, directory, latency=0.0, jitter=0.0, errorRate=0.0, seed=None): #latency and jitter in seconds, errorRate from 0 to 1
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def request(self, params):
+        with self.lock: #random.Random is shared by every fetch thread
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            failed = self.random.random() < self.errorRate
+        if(delay > 0):
+            time.sleep(delay)
+        if(failed):
+            raise TransportError("injected upstream error for %s" % json.dumps(params, sort_keys=True, default=str))
+        path = os.path.join(self.directory, requestKey(params) + ".json")
+        try:
+            with open(path) as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            raise MissingRecordingError("no recording for %s" % json.dumps(params, sort_keys=True, default=str))
+
+def transportFromEnv():
+    setting = os.environ.get("SHOTCHART_TRANSPORT", "live")
+    mode, _, directory = setting.partition(":")
+    if(mode == "live"):
+        return LiveTransport()
+    if(mode == "record"):
+        return RecordingTransport(directory or "recordings")
+    if(mode == "replay"):
+        return ReplayTransport(
+            directory or "recordings",
+            float(os.environ.get("SHOTCHART_LATENCY", 0)),
+            float(os.environ.get("SHOTCHART_JITTER", 0)),
+            float(os.environ.get("SHOTCHART_ERROR_RATE", 0))
+        )
+    raise ValueError("unknown SHOTCHART_TRANSPORT %r, expected live, record:<dir> or replay:<dir>" % setting)
+
+_transport = None
+
+def getTransport():
+    global _transport
+    if(_transport is None):
+        _transport = transportFromEnv()
+    return _transport
+
+def setTransport(transport):
+    global _transport
+    _transport = transport
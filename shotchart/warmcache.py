@@ -0,0 +1,90 @@
+#prefetches shot data for many players into the season partitioned shot cache so the dashboard never waits on stats.nba.com
+#python warmcache.py 2015 2019 --workers 4
+#nightly: python warmcache.py 2024 2025 --refresh
+#runs can be stopped at any time, the next run skips every player-season already in the cache
+
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from . import shotcache
+from .catalog import playerHasSeason
+
+def initWorker(cacheDir, interval):
+    shotcache.CACHE_DIR = cacheDir
+    shotcache.rateLimiter = shotcache.RateLimiter(interval) #every process keeps its own limiter, spaced so the pool as a whole stays under the rate
+
+def warmOne(playerID, season, contextMeasure, refresh=False):
+    start = time.time()
+    try:
+        if(refresh):
+            shotData = shotcache.refreshShotData(playerID, season, contextMeasure)
+        else:
+            shotData = shotcache.getShotData(playerID, season, contextMeasure)
+        return playerID, season, len(shotData), None, time.time() - start
+    except Exception as e: #one bad player-season must not stop the batch
+        return playerID, season, 0, "%s: %s" % (type(e).__name__, e), time.time() - start
+
+def warmJobs(playerList, seasons, contextMeasure, refresh=False):
+    jobs = []
+    for season in seasons:
+        refreshSeason = refresh and not shotcache.isFinishedSeason(season) #only the in-progress season gets new games
+        for player in playerList:
+            if(not playerHasSeason(player['id'], season)):
+                continue
+            if(not refreshSeason and shotcache.isCached(player['id'], season, contextMeasure)):
+                continue
+            jobs.append((player['id'], season, contextMeasure, refreshSeason))
+    return jobs
+
+def warmCache(startYear, endYear, workers=4, interval=shotcache.REQUEST_INTERVAL, contextMeasure="FGA", allPlayers=False, cacheDir=None, refresh=False):
+    if(cacheDir is not None):
+        shotcache.CACHE_DIR = cacheDir
+    from nba_api.stats.static import players #worker processes import this module and never need it
+    playerList = players.get_players() if allPlayers else players.get_active_players()
+    seasons = [shotcache.seasonString(year) for year in range(startYear, endYear)]
+    jobs = warmJobs(playerList, seasons, contextMeasure, refresh)
+    print("%d player-seasons to fetch, %d players, seasons %s" % (len(jobs), len(playerList), ", ".join(seasons)))
+
+    start = time.time()
+    done = 0
+    rows = 0
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=initWorker, initargs=(shotcache.CACHE_DIR, interval * workers)) as executor:
+        futures = [executor.submit(warmOne, *job) for job in jobs]
+        for future in as_completed(futures):
+            playerID, season, shots, error, seconds = future.result()
+            done += 1
+            if(error is None):
+                rows += shots
+            else:
+                failures.append((playerID, season, error))
+            if(done % 50 == 0 or done == len(jobs)):
+                elapsed = time.time() - start
+                print("%d/%d done, %.2f player-seasons/s, %d failed" % (done, len(jobs), done / max(elapsed, 1e-9), len(failures)))
+
+    elapsed = time.time() - start
+    print("fetched %d player-seasons (%d shots) in %.1fs, %.2f player-seasons/s" % (done - len(failures), rows, elapsed, (done - len(failures)) / max(elapsed, 1e-9)))
+    if(failures):
+        print("%d failed, run again to retry them:" % len(failures))
+        for playerID, season, error in failures:
+            print("  %s %s %s" % (playerID, season, error))
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prefetch shot chart data into the shot cache")
+    parser.add_argument("startYear", type=int, help="first season's start year, e.g. 2015 for 2015-16")
+    parser.add_argument("endYear", type=int, help="season start year to stop before, like range()")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--interval", type=float, default=shotcache.REQUEST_INTERVAL, help="least seconds between two requests across all workers")
+    parser.add_argument("--measure", default="FGA", help="context_measure_simple passed to ShotChartDetail")
+    parser.add_argument("--all-players", action="store_true", help="include retired players, not just active ones")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--refresh", action="store_true", help="append games played since the last run to the in-progress season even if its ttl has not run out")
+    args = parser.parse_args(argv)
+
+    failures = warmCache(args.startYear, args.endYear, args.workers, args.interval, args.measure, args.all_players, args.cache_dir, args.refresh)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
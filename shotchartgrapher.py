@@ -1,9 +1,9 @@
 #for multiple years and slider
 
-from nba_api.stats.static import players
-from nba_api.stats.endpoints.shotchartdetail import ShotChartDetail
-import pandas as pd
-import copy
+from shotchart.playerindex import getPlayerID
+from shotchart.courtshapes import getCourtShapes
+from shotchart.shotfigure import chartTraces, seasonSliderFigure
+from shotchart.shotcache import getShotData as getCachedShotData, getSeasonsData, seasonString
 from plotly.subplots import make_subplots
 import plotly.graph_objs as go
 
@@ -15,54 +15,49 @@ playerName = None
 
 def getShotData(name, year):
     global string_season
-    string_season = f"{str(year)}-{str(year+1)[-2:]}"
+    string_season = seasonString(year)
     #string_season = 2017-19
-    playerID = players.find_players_by_full_name(name)[0]['id']
-    shotchart_detail = ShotChartDetail(team_id = 0, player_id = playerID, season_nullable= string_season, context_measure_simple= "FGA")
-    shotData = shotchart_detail.get_data_frames()[0]
+    playerID = getPlayerID(name)
+    shotData = getCachedShotData(playerID, string_season)
     shotData["LOC_X"] *= -1
     return shotData
 
-def getShotData2(name, startYear, endYear):
+def getShotData2(name, startYear, endYear, maxWorkers=None): #maxWorkers=1 fetches the seasons one after another
     global string_season
     global seasonList
     global playerName
 
     playerName = name
     string_season = f"{str(startYear)}-{str(endYear)[-2:]}"
-    playerID = players.find_players_by_full_name(name)[0]['id']
-    shotDataList = []
-    
-    for year in range(startYear, endYear): #goes to 2019(endYear-1)
-        currentSeason = f"{str(year)}-{str(year+1)[-2:]}"
-        seasonList.append(currentSeason)
-        shotchart_detail = ShotChartDetail(team_id = 0, player_id = playerID, season_nullable= currentSeason, context_measure_simple= "FGA")
-        shotData = shotchart_detail.get_data_frames()[0]
+    playerID = getPlayerID(name)
+    seasons = [seasonString(year) for year in range(startYear, endYear)] #goes to 2019(endYear-1)
+    seasonList.extend(seasons)
+
+    shotDataList = getSeasonsData(playerID, seasons, maxWorkers=maxWorkers)
+    for shotData in shotDataList:
         shotData["LOC_X"] *= -1
-        shotDataList.append(shotData)
     return shotDataList
 
-def plotShots2():
+def plotShots2(renderer="auto", chartMode="shots"):
     shotDataList = getShotData2("Brook Lopez", 2014, 2019)
-    global seasonList
+    return subplotFigure(shotDataList, seasonList, renderer, chartMode)
+
+def subplotFigure(shotDataList, seasons, renderer="auto", chartMode="shots"): #the grid plotShots2 draws, shot data already flipped, split out so benchmark.py can time it without fetching
+    points = sum(len(shotData) for shotData in shotDataList) #the browser draws every subplot, so the whole figure picks svg or webgl
 
     fig=go.Figure() 
     if(len(shotDataList) % 2 == 0):
-        fig = make_subplots(rows=int(len(shotDataList)/2), cols=2, subplot_titles=seasonList)
+        fig = make_subplots(rows=int(len(shotDataList)/2), cols=2, subplot_titles=seasons)
     else:
-        fig = make_subplots(rows=int(len(shotDataList)/2)+1, cols=2, subplot_titles=seasonList)
+        fig = make_subplots(rows=int(len(shotDataList)/2)+1, cols=2, subplot_titles=seasons)
 
     shotData = shotDataList[0]
-    made_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 1]
-    missed_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 0]
-    fig.append_trace(go.Scatter(x=made_shots["LOC_X"], y=made_shots["LOC_Y"], mode='markers', marker_color="BLUE", name="Made Shot", opacity=0.5), 1,1) 
-    fig.append_trace(go.Scatter(x=missed_shots["LOC_X"], y=missed_shots["LOC_Y"], mode='markers', marker_color="Red", name="Missed Shot", opacity=0.5), 1,1)
+    for trace in chartTraces(shotData, chartMode, renderer, points, missedColor="Red", opacity=0.5):
+        fig.append_trace(trace, 1,1)
         
     shotData = shotDataList[1]
-    made_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 1]
-    missed_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 0]
-    fig.append_trace(go.Scatter(x=made_shots["LOC_X"], y=made_shots["LOC_Y"], mode='markers', marker_color="BLUE", name="Made Shot", showlegend=False, opacity=0.5), 1,2) 
-    fig.append_trace(go.Scatter(x=missed_shots["LOC_X"], y=missed_shots["LOC_Y"], mode='markers', marker_color="Red", name="Missed Shot", showlegend=False, opacity=0.5), 1,2)
+    for trace in chartTraces(shotData, chartMode, renderer, points, missedColor="Red", showlegend=False, opacity=0.5):
+        fig.append_trace(trace, 1,2)
         
     row = 2 #row number
     col = 1 #col number
@@ -70,10 +65,8 @@ def plotShots2():
         if(col==3): 
             col=1 #only two columns so reset col number back to 1 every 2 iterations of the for loop
             row+=1  #increment row number after both columns in row have had a graph appended to them
-        made_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 1]
-        missed_shots = shotData.loc[shotData.SHOT_MADE_FLAG == 0]
-        fig.append_trace(go.Scatter(x=made_shots["LOC_X"], y=made_shots["LOC_Y"], mode='markers', marker_color="BLUE", name="Made Shot", showlegend=False, opacity=0.5), row,col) 
-        fig.append_trace(go.Scatter(x=missed_shots["LOC_X"], y=missed_shots["LOC_Y"], mode='markers', marker_color="Red", name="Missed Shot", showlegend=False, opacity=0.5), row,col)
+        for trace in chartTraces(shotData, chartMode, renderer, points, missedColor="Red", showlegend=False, opacity=0.5):
+            fig.append_trace(trace, row,col)
         col+=1
 
     # shotData = shotDataList[0]
@@ -96,214 +89,14 @@ def makeShapes():
     global court_shapes
     global seasonList
 
-    outer_lines_shape = dict(
-        type='rect',
-        xref='x',
-        yref='y',
-        x0='-250',
-        y0='-47.5',
-        x1='250',
-        y1='422.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )
- 
-    court_shapes.append(outer_lines_shape)
-
-    hoop_shape = dict(
-        type='circle',
-        xref='x',
-        yref='y',
-        x0='7.5',
-        y0='7.5',
-        x1='-7.5',
-        y1='-7.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )
- 
-    court_shapes.append(hoop_shape)
-
-    backboard_shape = dict(
-        type='rect',
-        xref='x',
-        yref='y',
-        x0='-30',
-        y0='-7.5',
-        x1='30',
-        y1='-6.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        ),
-    fillcolor='rgba(10, 10, 10, 1)'
-    )
- 
-    court_shapes.append(backboard_shape)
-
-    outer_three_sec_shape = dict(
-        type='rect',
-        xref='x',
-        yref='y',
-        x0='-80',
-        y0='-47.5',
-        x1='80',
-        y1='143.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )
- 
-    court_shapes.append(outer_three_sec_shape)
-
-    inner_three_sec_shape = dict(
-        type='rect',
-        xref='x',
-        yref='y',
-        x0='-60',
-        y0='-47.5',
-        x1='60',
-        y1='143.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )
- 
-    court_shapes.append(inner_three_sec_shape)
-
-    left_line_shape = dict(
-        type='line',
-        xref='x',
-        yref='y',
-        x0='-220',
-        y0='-47.5',
-        x1='-220',
-        y1='92.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )
- 
-    court_shapes.append(left_line_shape)
-
-    right_line_shape = dict(
-        type='line',
-        xref='x',
-        yref='y',
-        x0='220',
-        y0='-47.5',
-        x1='220',
-        y1='92.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )   
- 
-    court_shapes.append(right_line_shape)
-
-    three_point_arc_shape = dict(
-        type='path',
-        xref='x',
-        yref='y',
-        path='M -220 92.5 C -70 300, 70 300, 220 92.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )
- 
-    court_shapes.append(three_point_arc_shape)
+    court_shapes = getCourtShapes(len(seasonList)) #cached per grid size, so no shapes are copied when the same grid is drawn again
 
-    center_circle_shape = dict(
-        type='circle',
-        xref='x',
-        yref='y',
-        x0='60',
-        y0='482.5',
-        x1='-60',
-        y1='362.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )
- 
-    court_shapes.append(center_circle_shape)
-
-    res_circle_shape = dict(
-        type='circle',
-        xref='x',
-        yref='y',
-        x0='20',
-        y0='442.5',
-        x1='-20',
-        y1='402.5',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )
- 
-    court_shapes.append(res_circle_shape)
-
-    free_throw_circle_shape = dict(
-        type='circle',
-        xref='x',
-        yref='y',
-        x0='60',
-        y0='200',
-        x1='-60',
-        y1='80',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1
-        )
-    )
- 
-    court_shapes.append(free_throw_circle_shape)
-
-    res_area_shape = dict(
-        type='circle',
-        xref='x',
-        yref='y',
-        x0='40',
-        y0='40',
-        x1='-40',
-        y1='-40',
-        line=dict(
-            color='rgba(10, 10, 10, 1)',
-            width=1,
-            dash='dot'
-        )
-    )
- 
-    court_shapes.append(res_area_shape)
-
-
-    temp_court_shapes = copy.deepcopy(court_shapes)
-    i = 2
-    for season in seasonList[1:]: #this loop adds more shapes to court_shapes in order for the basketball court to be drawn on all subplots by making new shapes with different xref and yref values
-        temp_court_shapes_two = copy.deepcopy(temp_court_shapes)
-        for shape in temp_court_shapes_two:
-            shape['xref'] = 'x'+ str(i)
-            shape['yref'] = 'y' + str(i)
-            court_shapes.append(shape)
-        i+=1
-
-def drawCourt2():
+def drawCourt2(renderer="auto", chartMode="shots"):
     global court_shapes
     global seasonList
     global playerName
     global string_season
-    fig = plotShots2()
+    fig = plotShots2(renderer, chartMode)
     
     makeShapes()
 
@@ -323,4 +116,15 @@ def drawCourt2():
     fig.update(layout=layout)
     fig.show()
 
-drawCourt2()
+def drawSlider(renderer="auto", chartMode="shots"): #same seasons as drawCourt2 on a single court, moved through with a slider
+    global seasonList
+    global playerName
+    global string_season
+    seasonList.clear()
+    shotDataList = getShotData2("Brook Lopez", 2014, 2019)
+
+    fig = seasonSliderFigure("%s shot data from %s" % (playerName,string_season), seasonList, dict(zip(seasonList, shotDataList)), chartMode, renderer, flipped=True)
+    fig.show()
+
+if __name__ == '__main__':
+    drawCourt2()
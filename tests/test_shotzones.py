@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+from shotchart.shotzones import zoneCodes, classifyShots, ZONES
+
+#raw stats.nba.com coordinates (tenths of a foot from the hoop, LOC_X < 0 on the "Left" side) -> SHOT_ZONE_BASIC
+KNOWN_SHOTS = [
+    ((0, 0), "Restricted Area"),
+    ((0, 40), "Restricted Area"), #restricted area edge, a 4 ft arc
+    ((0, 41), "In The Paint (Non-RA)"),
+    ((-79, 100), "In The Paint (Non-RA)"), #paint edge, 16 ft wide
+    ((81, 100), "Mid-Range"),
+    ((0, 143), "In The Paint (Non-RA)"), #free throw line
+    ((0, 145), "Mid-Range"),
+    ((-225, 50), "Left Corner 3"),
+    ((225, 50), "Right Corner 3"),
+    ((-215, 50), "Mid-Range"), #inside the 22 ft corner line
+    ((-225, 95), "Above the Break 3"), #above where the corner line meets the arc
+    ((0, 237), "Mid-Range"), #23.75 ft arc
+    ((0, 239), "Above the Break 3"),
+    ((0, 420), "Above the Break 3"),
+    ((0, 430), "Backcourt"), #past half court
+]
+
+@pytest.mark.parametrize("location, zone", KNOWN_SHOTS)
+def test_zone_codes_match_shot_zone_basic(location, zone):
+    x, y = location
+    assert ZONES[zoneCodes([x], [y])[0]] == zone
+
+def test_classify_shots_labels_every_row():
+    shotData = pd.DataFrame({"LOC_X": [x for (x, y), zone in KNOWN_SHOTS], "LOC_Y": [y for (x, y), zone in KNOWN_SHOTS]})
+    assert classifyShots(shotData).tolist() == [zone for location, zone in KNOWN_SHOTS]
@@ -0,0 +1,47 @@
+import time
+import pytest
+from shotchart import statshttp
+from shotchart.statshttp import CircuitBreaker, CircuitOpenError, UpstreamError, UpstreamStatusError, requestWithRetries
+from shotchart.transport import MissingRecordingError
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+    monkeypatch.setattr(statshttp, "breaker", breaker)
+    monkeypatch.setattr(statshttp, "backoff", lambda attempt: 0)
+    return breaker
+
+def timeout():
+    raise IOError("timed out")
+
+def openCircuit(breaker):
+    with pytest.raises(UpstreamError):
+        requestWithRetries(timeout, retries=1)
+    assert breaker.isOpen()
+    with pytest.raises(CircuitOpenError):
+        requestWithRetries(lambda: "ok")
+    time.sleep(breaker.cooldown)
+
+@pytest.mark.parametrize("error", [UpstreamStatusError(400), MissingRecordingError("no recording")])
+def test_probe_ending_in_a_non_retryable_error_does_not_wedge_the_breaker(breaker, error):
+    openCircuit(breaker)
+
+    def probe():
+        raise error
+    with pytest.raises(UpstreamError): #both reach the app as upstream failures
+        requestWithRetries(probe)
+    assert not breaker.probing
+
+    time.sleep(breaker.cooldown)
+    assert requestWithRetries(lambda: "ok") == "ok"
+    assert not breaker.isOpen()
+
+def test_non_retryable_errors_are_not_retried(breaker):
+    calls = []
+    def send():
+        calls.append(1)
+        raise MissingRecordingError("no recording")
+    with pytest.raises(MissingRecordingError):
+        requestWithRetries(send, retries=3)
+    assert len(calls) == 1
+    assert not breaker.isOpen()
@@ -0,0 +1,7 @@
+#kept so "python warmcache.py" still works, the code lives in shotchart/warmcache.py
+
+import sys
+from shotchart.warmcache import main
+
+if __name__ == '__main__':
+    sys.exit(main())